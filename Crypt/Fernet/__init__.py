@@ -1,6 +1,39 @@
-import base64, hashlib
+import base64, hashlib, hmac, os
 
-from cryptography.fernet import Fernet as Fern
+from argon2.low_level import hash_secret_raw, Type
+from collections import OrderedDict
+from cryptography.fernet import Fernet as Fern, InvalidToken
+from threading import Lock
+from typing import Dict, Iterable, Iterator, List, Tuple
+
+""" Use example:
+from My_Pack.Crypt.Fernet import Fernet, Keyring
+
+keyring = Keyring([new_key, old_key]) # First key is the primary one
+token = keyring.encrypt(b'data')
+data = keyring.decrypt(token) # Also reads tokens of the other keys, and plain Fernet tokens
+
+for batch in keyring.rotate(stored_tokens, batch_size = 500):
+    save(batch) # Same order as [stored_tokens], all under the primary key now
+keyring.remove_key(old_key)
+
+# Keys from passphrases: salted and deliberately slow, but derived only once per process
+key = Fernet.generate_key_from_string('passphrase', salt = stored_salt, kdf = KDF_SCRYPT)
+"""
+
+KDF_SCRYPT = 'scrypt'
+KDF_PBKDF2 = 'pbkdf2'
+KDF_ARGON2 = 'argon2'
+
+# Default cost parameters of each KDF, overridable per call
+KDF_PARAMS: Dict[str, Dict[str, int]] = {
+    KDF_SCRYPT: {'n': 2 ** 15, 'r': 8, 'p': 1},
+    KDF_PBKDF2: {'iterations': 600000},
+    KDF_ARGON2: {'time_cost': 3, 'memory_cost': 65536, 'parallelism': 4}
+}
+
+# How many derived keys [Fernet.generate_key_from_string] remembers
+KDF_CACHE_SIZE: int = 64
 
 class Fernet(object):
     def __init__(self, key: bytes = None):
@@ -28,5 +61,205 @@ class Fernet(object):
         return Fern.generate_key()
     
     @staticmethod
-    def generate_key_from_string(string: str) -> bytes:
-        return base64.urlsafe_b64encode(hashlib.sha256(string.encode('utf-8')).digest())
\ No newline at end of file
+    def generate_key_from_string(string: str, salt: bytes = None, kdf: str = None, **params) -> bytes:
+        """Derives a Fernet key from [string].
+        Without [salt] and [kdf] it's a single unsalted SHA-256, kept for keys made that way before. Prefer a KDF with a random, stored salt.
+        KDF results are kept in a small LRU cache, keyed on a hash of [string], [salt], [kdf] and [params], so only the first call pays for it.
+
+        Args:
+            string (str): Passphrase.
+            salt (bytes, optional): Salt, at least 16 bytes. Required by [kdf]. Defaults to None.
+            kdf (str, optional): KDF_SCRYPT, KDF_PBKDF2 or KDF_ARGON2. Defaults to KDF_SCRYPT if [salt] is given, else None.
+            **params: Cost parameters overriding [KDF_PARAMS[kdf]].
+
+        Raises:
+            ValueError: Raises if [kdf] is unknown, or [salt] is missing or too short.
+
+        Returns:
+            bytes: URL-safe base64 encoded 32 bytes key.
+        """
+        if salt is None and kdf is None:
+            return base64.urlsafe_b64encode(hashlib.sha256(string.encode('utf-8')).digest())
+
+        kdf = kdf or KDF_SCRYPT
+        if kdf not in KDF_PARAMS:
+            raise ValueError(f'[kdf] must be KDF_SCRYPT, KDF_PBKDF2 or KDF_ARGON2, but got \'{kdf}\'')
+        if salt is None or len(salt) < 16:
+            raise ValueError('[salt] must be at least 16 bytes long')
+
+        params = {**KDF_PARAMS[kdf], **params}
+        # Keyed with a per process secret: a plain hash of [string] would be as cheap to brute force as the legacy key
+        digest = hmac.new(Fernet.__cacheSecret, string.encode('utf-8'), hashlib.sha256).digest()
+        cache_key = (kdf, digest, bytes(salt), tuple(sorted(params.items())))
+
+        with Fernet.__cacheLock:
+            key = Fernet.__cache.get(cache_key)
+            if key is not None:
+                Fernet.__cache.move_to_end(cache_key)
+                return key
+
+        # Derived outside the lock, so one slow derivation doesn't block the others. Two racing ones give the same key.
+        secret = string.encode('utf-8')
+        if kdf == KDF_SCRYPT:
+            maxmem = 128 * params['r'] * (params['n'] + params['p'] + 2)
+            raw = hashlib.scrypt(secret, salt = salt, dklen = 32, maxmem = maxmem, **params)
+        elif kdf == KDF_PBKDF2:
+            raw = hashlib.pbkdf2_hmac('sha256', secret, salt, params['iterations'], 32)
+        else:
+            raw = hash_secret_raw(secret, salt, hash_len = 32, type = Type.ID, **params)
+
+        key = base64.urlsafe_b64encode(raw)
+        with Fernet.__cacheLock:
+            Fernet.__cache[cache_key] = key
+            Fernet.__cache.move_to_end(cache_key)
+            while len(Fernet.__cache) > KDF_CACHE_SIZE:
+                Fernet.__cache.popitem(last = False)
+
+        return key
+
+    @staticmethod
+    def clear_key_cache():
+        """Forgets every key derived by [Fernet.generate_key_from_string]."""
+        with Fernet.__cacheLock:
+            Fernet.__cache.clear()
+
+    __cache: OrderedDict = OrderedDict() # {(kdf, hmac(__cacheSecret, string), salt, params): key}
+    __cacheLock: Lock = Lock()
+    __cacheSecret: bytes = os.urandom(32)
+
+
+class Keyring(object):
+    """
+        Several Fernet keys, for key rotation. Encrypts with the primary key and prefixes tokens with its key id
+        (b'<key id>.<fernet token>', Fernet tokens never contain a dot), so decryption goes straight to the right key.
+        Tokens without the prefix, e.g. from [Fernet], are tried against each key, primary first.
+    """
+
+    def __init__(self, keys: Iterable[bytes] = None):
+        """
+        Args:
+            keys (Iterable[bytes], optional): Fernet keys, the first one being the primary. Defaults to a new random key.
+        """
+        keys = list(keys) if keys else [Fernet.generate_key()]
+
+        self.__lock = Lock()
+        # Replaced as a whole on changes, so readers never need the lock
+        self.__keys: Tuple[Tuple[bytes, Fern], ...] = () # ((key id, fernet), ...), primary first
+        self.__index: Dict[bytes, Fern] = {}
+
+        for key in reversed(keys):
+            self.add_key(key)
+
+    @property
+    def primary_key_id(self) -> bytes:
+        return self.__keys[0][0]
+
+    @property
+    def key_ids(self) -> List[bytes]:
+        return [key_id for key_id, _ in self.__keys]
+
+    def add_key(self, key: bytes, primary: bool = True):
+        """
+            Adds [key], as the new primary key unless [primary] is False. Adding a known key only moves it.
+        """
+        fernet, key_id = Fern(key), Keyring.key_id(key)
+        with self.__lock:
+            keys = [item for item in self.__keys if item[0] != key_id]
+            keys.insert(0 if primary else len(keys), (key_id, fernet))
+            self.__set(keys)
+
+    def remove_key(self, key: bytes):
+        """
+            Removes [key]. Tokens made with it can't be decrypted anymore, see [Keyring.rotate].
+        """
+        key_id = Keyring.key_id(key)
+        with self.__lock:
+            keys = [item for item in self.__keys if item[0] != key_id]
+            if not keys:
+                raise ValueError('Can\'t remove the last key')
+            if len(keys) == len(self.__keys):
+                raise ValueError('[key] is not in the keyring')
+            self.__set(keys)
+
+    def encrypt(self, data: bytes) -> bytes:
+        key_id, fernet = self.__keys[0]
+        return key_id + b'.' + fernet.encrypt(data)
+
+    def encrypt_at_time(self, data: bytes, time: int) -> bytes:
+        key_id, fernet = self.__keys[0]
+        return key_id + b'.' + fernet.encrypt_at_time(data, time)
+
+    def decrypt(self, token: bytes, ttl: int = None) -> bytes:
+        """
+        Raises:
+            InvalidToken: Raises if no key can decrypt [token], or it is older than [ttl] seconds.
+        """
+        fernet, token = self.__find(token)
+        return fernet.decrypt(token, ttl)
+
+    def decrypt_at_time(self, token: bytes, ttl: int, time: int) -> bytes:
+        fernet, token = self.__find(token)
+        return fernet.decrypt_at_time(token, ttl, time)
+
+    def extract_timestamp(self, token: bytes) -> int:
+        fernet, token = self.__find(token)
+        return fernet.extract_timestamp(token)
+
+    def rotate(self, tokens: Iterable[bytes], batch_size: int = 1000) -> Iterator[List[bytes]]:
+        """
+            Re-encrypts [tokens] with the primary key, keeping their timestamps, and yields them [batch_size] at a time, in order.
+            Tokens already under the primary key are yielded as they are, so rotating again is cheap.
+            Reads [tokens] lazily: store each batch before the next one is made.
+
+        Raises:
+            InvalidToken: Raises if no key can decrypt a token.
+        """
+        if batch_size < 1:
+            raise ValueError('[batch_size] must be at least 1')
+
+        batch = []
+        for token in tokens:
+            batch.append(self.__rotate(token))
+            if len(batch) >= batch_size:
+                yield batch
+                batch = []
+
+        if batch:
+            yield batch
+
+    @staticmethod
+    def key_id(key: bytes) -> bytes:
+        """
+            Returns [key]'s id: 8 URL-safe base64 characters of its SHA-256.
+        """
+        return base64.urlsafe_b64encode(hashlib.sha256(key).digest()[:6])
+
+    def __set(self, keys: List[Tuple[bytes, Fern]]):
+        self.__keys = tuple(keys)
+        self.__index = dict(keys)
+
+    def __rotate(self, token: bytes) -> bytes:
+        primary_id, primary = self.__keys[0]
+        if token.startswith(primary_id + b'.'):
+            return token
+
+        fernet, token = self.__find(token)
+        return primary_id + b'.' + primary.encrypt_at_time(fernet.decrypt(token), fernet.extract_timestamp(token))
+
+    def __find(self, token: bytes) -> Tuple[Fern, bytes]:
+        # Returns the key able to decrypt [token], and the bare Fernet token
+        key_id, dot, bare = token.partition(b'.')
+        if dot:
+            fernet = self.__index.get(key_id)
+            if fernet is None:
+                raise InvalidToken
+            return (fernet, bare)
+
+        for _, fernet in self.__keys:
+            try:
+                fernet.extract_timestamp(token) # Checks the signature only
+                return (fernet, token)
+            except InvalidToken:
+                pass
+
+        raise InvalidToken
@@ -1,9 +1,49 @@
 from argon2 import PasswordHasher, extract_parameters, Parameters
 from argon2.exceptions import VerifyMismatchError
+from My_Pack.Essentials import ensureType
+from My_Pack.Threading import Threading, Retention, Profiler, TimedOutException, awaitTask
+from threading import Condition
+from collections import deque
+from typing import Any, Callable, Dict, Iterable, List, NamedTuple, Tuple, Union
+import asyncio, os, statistics, time
 
 
 # i would recommend using Argon2
 
+""" Use example:
+from My_Pack.Crypt.Hashlib import Argon2, Argon2Service
+
+# At most 1 GiB of Argon2 memory at once, whatever the login burst
+service = Argon2Service(Argon2(), memory_budget = 1024 * 1024, max_queue = 200, timeout = 5)
+
+if service.verify(stored_hash, password):
+    ...
+
+service.stats()['queued']
+
+# From asyncio handlers, without blocking the loop
+if await service.verify_async(stored_hash, password, timeout = 2):
+    ...
+
+# Parameters for this machine: ~0.5s per hash, at most 256 MiB
+argon2 = calibrate(target = 0.5, max_memory = 262144).argon2
+
+# On login: verify, and upgrade the stored hash if it was made with older parameters
+ok, new_hash = argon2.verify_and_rehash(stored_hash, password)
+if new_hash:
+    save(new_hash)
+"""
+
+class OverloadedException(Exception):
+    """ Raised by [Argon2Service] when its queue is full. """
+    pass
+
+class Calibration(NamedTuple):
+    """ Result of [calibrate]. """
+    argon2: 'Argon2'
+    seconds: float # Median time of one hash with [argon2]'s parameters
+    results: Dict[Tuple[int, int, int], float] # {(time_cost, memory_cost, parallelism): seconds} of every combination tried
+
 class Argon2(object):
     def __init__(self, time_cost: int = 8, memory_cost: int = 102400, parallelism: int = 8, hash_len: int = 64, salt_len: int = 128):
         self.ph = PasswordHasher(time_cost = time_cost, memory_cost = memory_cost, parallelism = parallelism, hash_len = hash_len, salt_len = salt_len)
@@ -32,4 +72,380 @@ class Argon2(object):
         return self.ph.check_needs_rehash(hash)
     
     def extract_parameters(self, hash: str) -> Parameters:
-        return extract_parameters(hash)
\ No newline at end of file
+        return extract_parameters(hash)
+
+    def verify_and_rehash(self, hash: str, data: str) -> Tuple[bool, Union[str, None]]:
+        """Verifies [data] against [hash] and, if it matches but [hash] was made with other parameters, hashes it again with the current ones.
+        Meant for logins, the only time the plain password is known.
+
+        Returns:
+            Tuple[bool, str | None]: Whether [data] matched, and the new hash to store, or [None] if [hash] is up to date.
+        """
+        if not self.verify(hash, data):
+            return (False, None)
+        if not self.needs_rehash(hash):
+            return (True, None)
+        return (True, self.create_hash(data))
+
+    def outdated(self, hashes: Iterable[str]) -> List[int]:
+        """Returns the positions of [hashes] made with other parameters than this hasher's. Nothing is hashed, it's cheap."""
+        return [pos for pos, hash in enumerate(hashes) if self.needs_rehash(hash)]
+
+
+def benchmark(time_cost: int, memory_cost: int, parallelism: int, rounds: int = 3) -> float:
+    """Times Argon2id hashes with the given parameters on this machine.
+
+    Args:
+        time_cost (int): Passes over memory.
+        memory_cost (int): Memory, in KiB.
+        parallelism (int): Lanes and threads.
+        rounds (int, optional): Hashes to time. Defaults to 3.
+
+    Returns:
+        float: Median seconds per hash.
+    """
+    ph = PasswordHasher(time_cost = time_cost, memory_cost = memory_cost, parallelism = parallelism, salt_len = 16)
+
+    timings = []
+    for _ in range(rounds):
+        start = time.perf_counter()
+        ph.hash('benchmark')
+        timings.append(time.perf_counter() - start)
+
+    return statistics.median(timings)
+
+def calibrate(target: float = 0.5, max_memory: int = 102400, parallelism: int = None, min_memory: int = 19456,
+              hash_len: int = 64, salt_len: int = 128, rounds: int = 3) -> Calibration:
+    """Picks the strongest Argon2 parameters hashing in about [target] seconds on this machine, within [max_memory].
+    Memory is favoured over passes, as recommended by RFC 9106: memory starts at [max_memory] and is halved until one pass fits [target],
+    then [time_cost] grows as far as [target] allows. Unless [parallelism] is given, this search runs for 1, 2, 4 and 8 lanes
+    (up to the CPU count, at most 8) and the strongest result within [target] wins: most memory, then most passes, then fastest.
+
+    Args:
+        target (float, optional): Wanted seconds per hash. Defaults to 0.5.
+        max_memory (int, optional): Memory ceiling per hash, in KiB. Defaults to 102400.
+        parallelism (int, optional): Lanes, to skip the lanes search. Defaults to None.
+        min_memory (int, optional): Memory floor, in KiB, chosen even if too slow. Defaults to 19456 (OWASP's minimum).
+        hash_len (int, optional): See [Argon2]. Defaults to 64.
+        salt_len (int, optional): See [Argon2]. Defaults to 128.
+        rounds (int, optional): Hashes timed per combination. Defaults to 3.
+
+    Returns:
+        Calibration: The configured [Argon2], its measured time and every combination tried.
+    """
+    if target <= 0:
+        raise ValueError('[target] must be greater than 0')
+    if max_memory < min_memory:
+        raise ValueError('[max_memory] must be at least [min_memory]')
+
+    if parallelism is None:
+        lanes = min(os.cpu_count() or 1, 8)
+        candidates = sorted({count for count in (1, 2, 4) if count < lanes} | {lanes})
+    else:
+        candidates = [parallelism]
+    results = {}
+
+    def measure(time_cost: int, memory_cost: int, parallelism: int) -> float:
+        if (time_cost, memory_cost, parallelism) not in results:
+            results[(time_cost, memory_cost, parallelism)] = benchmark(time_cost, memory_cost, parallelism, rounds)
+        return results[(time_cost, memory_cost, parallelism)]
+
+    def search(parallelism: int) -> Tuple[int, int, int]:
+        memory_cost = max_memory
+        while measure(1, memory_cost, parallelism) > target and memory_cost // 2 >= min_memory:
+            memory_cost //= 2
+
+        # Time grows about linearly with passes: estimate, then step back while too slow
+        one_pass = measure(1, memory_cost, parallelism)
+        per_pass = measure(2, memory_cost, parallelism) - one_pass if one_pass * 2 <= target else None
+        time_cost = 1
+        if per_pass is not None:
+            time_cost = max(2, int(1 + (target - one_pass) / max(per_pass, 1e-9)))
+            while time_cost > 1 and measure(time_cost, memory_cost, parallelism) > target:
+                time_cost -= 1
+
+        return (time_cost, memory_cost, parallelism)
+
+    def strength(found: Tuple[int, int, int]) -> tuple:
+        seconds = results[found]
+        return (seconds <= target, found[1], found[0], -seconds)
+
+    time_cost, memory_cost, parallelism = max((search(count) for count in candidates), key = strength)
+
+    argon2 = Argon2(time_cost = time_cost, memory_cost = memory_cost, parallelism = parallelism, hash_len = hash_len, salt_len = salt_len)
+    return Calibration(argon2, results[(time_cost, memory_cost, parallelism)], results)
+
+
+class Argon2Service(object):
+    """Runs [Argon2] hashes and verifications on a worker pool bounded by a memory budget.
+    Each hash holds its [memory_cost] (the stored hash's own one for [verify]) from the budget while it runs,
+    so concurrent logins never ask for more than [memory_budget]. Excess requests wait in a bounded queue,
+    and requests still queued at their deadline are dropped without being hashed.
+    """
+
+    def __init__(self, argon2: Argon2 = None, memory_budget: int = 1048576, max_workers: int = None, max_queue: int = 128, timeout: float = None):
+        """
+        Args:
+            argon2 (Argon2, optional): Hasher to use. Defaults to Argon2().
+            memory_budget (int, optional): Argon2 memory allowed at once, in KiB like [memory_cost]. Defaults to 1048576 (1 GiB).
+            max_workers (int, optional): Upper bound on the workers, else [memory_budget] // [memory_cost]. Defaults to None.
+            max_queue (int, optional): Requests allowed to wait for a worker before new ones are rejected. Defaults to 128.
+            timeout (float, optional): Default deadline of each request, in seconds, queue time included. Defaults to None.
+
+        Raises:
+            ValueError: Raises if [memory_budget] can't fit a single hash.
+        """
+        self.argon2 = argon2 or Argon2()
+        ensureType(memory_budget, int, 'memory_budget')
+        ensureType(max_queue, int, 'max_queue')
+
+        self.memory_cost = self.argon2.ph.memory_cost
+        if memory_budget < self.memory_cost:
+            raise ValueError(f'[memory_budget] must be at least [memory_cost] ({self.memory_cost} KiB)')
+        if max_queue < 0:
+            raise ValueError('[max_queue] must be at least 0')
+
+        workers = memory_budget // self.memory_cost
+        if max_workers is not None:
+            ensureType(max_workers, int, 'max_workers')
+            workers = max(1, min(workers, max_workers))
+
+        self.memory_budget = memory_budget
+        self.max_queue = max_queue
+        self.timeout = timeout
+        self.workers = workers
+
+        # Latency per operation ('hash' or 'verify'): [wait] is queue time, [run] is memory wait plus hashing
+        self.profiler = Profiler(tag = 'operation')
+        self.threading = Threading(workers = workers, retention = Retention(keep_last = max_queue + workers, drop_on_result = True), profiler = self.profiler)
+
+        self.__condition: Condition = Condition()
+        self.__memory: int = 0 # KiB held by running hashes
+        self.__queued: int = 0
+        self.__running: int = 0
+        self.__rejected: int = 0
+        self.__timedOut: int = 0
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.shutdown()
+
+    @property
+    def queue_depth(self) -> int:
+        return self.__queued
+
+    def stats(self) -> Dict[str, Any]:
+        """Returns the current load and the latency histograms, see [Profiler.AsDict].
+
+        Returns:
+            Dict[str, Any]: {'workers', 'queued', 'running', 'memory_in_use', 'memory_budget', 'rejected', 'timed_out', 'latency'}
+        """
+        with self.__condition:
+            stats = {
+                'workers': self.workers,
+                'queued': self.__queued,
+                'running': self.__running,
+                'memory_in_use': self.__memory,
+                'memory_budget': self.memory_budget,
+                'rejected': self.__rejected,
+                'timed_out': self.__timedOut
+            }
+        stats['latency'] = self.profiler.AsDict()
+        return stats
+
+    def create_hash(self, data: str, timeout: float = None) -> str:
+        """Hashes [data] on the pool. See [Argon2.create_hash] and [Argon2Service.verify] for [timeout] and errors."""
+        return self.__wait(self.submit_hash(data, timeout))
+
+    def verify(self, hash: str, data: str, timeout: float = None) -> bool:
+        """Verifies [data] against [hash] on the pool. See [Argon2.verify].
+
+        Args:
+            hash (str): An Argon2 hashed value.
+            data (str): A [str] to verify.
+            timeout (float, optional): Deadline in seconds, queue time included. Defaults to [Argon2Service.timeout].
+
+        Raises:
+            OverloadedException: Raises if the queue is full.
+            TimedOutException: Raises if the deadline passed first.
+
+        Returns:
+            bool: [True] if [data] matches [hash], else [False].
+        """
+        return self.__wait(self.submit_verify(hash, data, timeout))
+
+    def submit_hash(self, data: str, timeout: float = None):
+        """Like [Argon2Service.create_hash], but returns the queued task at once. See [BaseTask.result]."""
+        return self.__submit('hash', self.memory_cost, self.argon2.create_hash, (data,), timeout)
+
+    def submit_verify(self, hash: str, data: str, timeout: float = None):
+        """Like [Argon2Service.verify], but returns the queued task at once. See [BaseTask.result]."""
+        cost = self.argon2.extract_parameters(hash).memory_cost
+        if cost > self.memory_budget:
+            raise ValueError(f'[hash] needs {cost} KiB, more than [memory_budget]')
+
+        return self.__submit('verify', cost, self.argon2.verify, (hash, data), timeout)
+
+    def verify_and_rehash(self, hash: str, data: str, timeout: float = None) -> Tuple[bool, Union[str, None]]:
+        """[Argon2.verify_and_rehash] on the pool. See [Argon2Service.verify] for [timeout] and errors."""
+        return self.__wait(self.__submitRehash(hash, data, timeout))
+
+    def verify_and_rehash_many(self, items: Iterable[Tuple[str, str]], timeout: float = None) -> List[Union[Tuple[bool, Union[str, None]], Exception]]:
+        """[Argon2.verify_and_rehash] for every (hash, data) of [items], for a batch of logins.
+        At most [max_queue] items are queued at once, so a batch never gets rejected by its own size.
+
+        Returns:
+            List[Tuple[bool, str | None] | Exception]: Results in the same order. Failed items (e.g. timed out, invalid hash) hold their exception.
+        """
+        results, window = [], deque()
+
+        def collect():
+            task = window.popleft()
+            if isinstance(task, Exception):
+                results.append(task)
+                return
+            try:
+                results.append(self.__wait(task))
+            except Exception as e:
+                results.append(e)
+
+        for hash, data in items:
+            while len(window) >= max(1, self.max_queue):
+                collect()
+            try:
+                window.append(self.__submitRehash(hash, data, timeout))
+            except OverloadedException:
+                # Shared with other callers: wait for our oldest item, then retry
+                if not window:
+                    raise
+                collect()
+                window.append(self.__submitRehash(hash, data, timeout))
+            except Exception as e:
+                window.append(e)
+
+        while window:
+            collect()
+
+        return results
+
+    async def create_hash_async(self, data: str, timeout: float = None) -> str:
+        """Async [Argon2Service.create_hash]. See [Argon2Service.verify_async]."""
+        return await self.__await(self.submit_hash(data, timeout))
+
+    async def verify_async(self, hash: str, data: str, timeout: float = None) -> bool:
+        """Async [Argon2Service.verify]: the hash runs on the pool and the event loop is only woken up once it's done.
+        Cancelling the awaiting coroutine drops the request if it is still queued.
+
+        Raises:
+            OverloadedException: Raises if the queue is full.
+            TimedOutException: Raises if the deadline passed first.
+
+        Returns:
+            bool: [True] if [data] matches [hash], else [False].
+        """
+        return await self.__await(self.submit_verify(hash, data, timeout))
+
+    async def verify_and_rehash_async(self, hash: str, data: str, timeout: float = None) -> Tuple[bool, Union[str, None]]:
+        """Async [Argon2Service.verify_and_rehash]. See [Argon2Service.verify_async]."""
+        return await self.__await(self.__submitRehash(hash, data, timeout))
+
+    def shutdown(self, wait: bool = True):
+        """Stops the workers once the queued requests are done."""
+        self.threading.Shutdown(wait)
+
+    def __submitRehash(self, hash: str, data: str, timeout: Union[float, None]):
+        # Verifying and rehashing run one after the other, so the bigger of both costs is enough
+        cost = max(self.argon2.extract_parameters(hash).memory_cost, self.memory_cost)
+        if cost > self.memory_budget:
+            raise ValueError(f'[hash] needs {cost} KiB, more than [memory_budget]')
+
+        return self.__submit('rehash', cost, self.argon2.verify_and_rehash, (hash, data), timeout)
+
+    def __submit(self, operation: str, cost: int, function: Callable, args: Tuple, timeout: Union[float, None]):
+        timeout = self.timeout if timeout is None else timeout
+        started = [False] # Set by [Argon2Service.__run], tells dropped requests apart
+
+        with self.__condition:
+            if self.__queued >= self.max_queue + max(0, self.workers - self.__running):
+                self.__rejected += 1
+                raise OverloadedException(f'Argon2 queue is full ({self.__queued} waiting)')
+            self.__queued += 1
+
+        try:
+            _, task = self.threading.AddThread(self.__run, (cost, function, args, started), run = True, custom_data = {'operation': operation},
+                                               done_callback = lambda task: self.__done(started), timeout = timeout)
+        except BaseException:
+            with self.__condition:
+                self.__queued -= 1
+            raise
+
+        return task
+
+    def __wait(self, task) -> Any:
+        try:
+            try:
+                # A request queued past its deadline is only dropped once a worker reaches it, don't wait that long
+                return task.result(task.timeout)
+            except TimeoutError:
+                # Running hashes can't be interrupted, they finish in the background
+                task.token.cancel(TimedOutException(f'Request did not finish in {task.timeout} seconds'))
+                raise task.token.exception from None
+
+        except TimedOutException:
+            with self.__condition:
+                self.__timedOut += 1
+            raise
+
+    async def __await(self, task) -> Any:
+        try:
+            # [wait_for] cancels only the asyncio future, the task is told below
+            return await asyncio.wait_for(awaitTask(task), task.timeout)
+
+        except asyncio.TimeoutError:
+            task.token.cancel(TimedOutException(f'Request did not finish in {task.timeout} seconds'))
+            with self.__condition:
+                self.__timedOut += 1
+            raise task.token.exception from None
+
+        except TimedOutException:
+            with self.__condition:
+                self.__timedOut += 1
+            raise
+
+        except asyncio.CancelledError:
+            task.cancel()
+            raise
+
+    def __done(self, started: list):
+        # Requests dropped at their deadline never reached [Argon2Service.__run]
+        with self.__condition:
+            if not started[0]:
+                started[0] = True
+                self.__queued -= 1
+
+    def __run(self, cost: int, function: Callable, args: Tuple, started: list, **kwargs) -> Any:
+        token = kwargs['cancel_token']
+
+        with self.__condition:
+            started[0] = True
+            self.__queued -= 1
+            self.__running += 1
+            try:
+                while self.__memory + cost > self.memory_budget:
+                    token.raiseIfCancelled()
+                    self.__condition.wait(0.05)
+                token.raiseIfCancelled()
+                self.__memory += cost
+            except BaseException:
+                self.__running -= 1
+                raise
+
+        try:
+            return function(*args)
+        finally:
+            with self.__condition:
+                self.__memory -= cost
+                self.__running -= 1
+                self.__condition.notify_all()
@@ -1,7 +1,102 @@
-import secrets
+import base64, os, weakref
+from threading import Lock
+from typing import List
+
+""" Use example:
+from My_Pack.Crypt import generateRandomToken, generateMany
+
+session_id = generateRandomToken(32)
+session_ids = generateMany(1000, 32) # One entropy read, one base64 encoding
+"""
+
+# Bytes pulled from the OS at once by [RandomBuffer]
+RANDOM_BLOCK_SIZE: int = 65536
+
+
+class RandomBuffer(object):
+    """ Thread safe buffer over [os.urandom]: entropy is read in blocks of [block_size] bytes and handed out in slices.
+    Every byte is handed out once at most. The buffer is dropped in forked children (see [os.register_at_fork]), so parent and child never share bytes.
+    Reads of [block_size] bytes or more skip the buffer.
+    """
+
+    def __init__(self, block_size: int = RANDOM_BLOCK_SIZE):
+        if block_size < 1:
+            raise ValueError('[block_size] must be at least 1')
+
+        self.block_size = block_size
+
+        self.__lock: Lock = Lock()
+        self.__buffer: bytes = b''
+        self.__position: int = 0
+
+        RandomBuffer.__instances.add(self)
+
+    def read(self, size: int) -> bytes:
+        """ Returns [size] random bytes. """
+        if size < 0:
+            raise ValueError('[size] must be at least 0')
+        if size >= self.block_size:
+            return os.urandom(size)
+
+        with self.__lock:
+            start = self.__position
+            end = start + size
+            if end > len(self.__buffer):
+                self.__buffer = os.urandom(self.block_size)
+                start, end = 0, size
+
+            self.__position = end
+            return self.__buffer[start:end]
+
+    def token(self, size: int) -> str:
+        """ Returns a URL-safe text token of [size] characters. See [generateRandomToken]. """
+        if size < 0:
+            raise ValueError('[size] must be at least 0')
+
+        # 3 bytes per 4 characters, less than a byte left unused
+        return base64.urlsafe_b64encode(self.read(-(-size * 3 // 4)))[:size].decode('ascii')
+
+    def tokens(self, n: int, size: int) -> List[str]:
+        """ Returns [n] URL-safe text tokens of [size] characters. See [generateMany]. """
+        if n < 0 or size < 0:
+            raise ValueError('[n] and [size] must be at least 0')
+
+        # Whole base64 groups per token (3 bytes -> 4 characters), so all of them encode in one call
+        groups = -(-size // 4)
+        encoded = base64.urlsafe_b64encode(self.read(3 * groups * n)).decode('ascii')
+        return [encoded[pos:pos + size] for pos in range(0, 4 * groups * n, 4 * groups)] if groups else [''] * n
+
+    def _reset(self):
+        """ Drops the buffered bytes. Must be called holding [RandomBuffer.__lock], or from a just forked child. """
+        self.__buffer = b''
+        self.__position = 0
+
+    @staticmethod
+    def _afterFork():
+        # Children must not hand out bytes their parent still holds
+        for buffer in list(RandomBuffer.__instances):
+            buffer.__lock = Lock() # Might have been held by another parent thread while forking
+            buffer._reset()
+
+    __instances: 'weakref.WeakSet[RandomBuffer]' = weakref.WeakSet()
+
+if hasattr(os, 'register_at_fork'):
+    os.register_at_fork(after_in_child = RandomBuffer._afterFork)
+
+__buffer = RandomBuffer()
+
 
 def generateRandomToken(size: int = 32) -> str:
-    return secrets.token_urlsafe(size)[:size]
+    return __buffer.token(size)
 
 def generateRandomByteToken(size: int = 32) -> bytes:
-    return secrets.token_bytes(size)[:size]
\ No newline at end of file
+    return __buffer.read(size)
+
+def generateMany(n: int, size: int = 32) -> List[str]:
+    """ Returns [n] tokens like [generateRandomToken]'s, drawn together. """
+    return __buffer.tokens(n, size)
+
+def generateManyBytes(n: int, size: int = 32) -> List[bytes]:
+    """ Returns [n] tokens like [generateRandomByteToken]'s, drawn together. """
+    data = __buffer.read(n * size)
+    return [data[pos:pos + size] for pos in range(0, n * size, size)] if size else [b''] * n
@@ -0,0 +1,182 @@
+from requests import Session, Response
+from requests.adapters import HTTPAdapter
+from urllib3.connection import HTTPConnection
+from urllib3.util.retry import Retry
+from threading import Lock, local
+from typing import Dict, Iterable, List, Union
+import socket, weakref
+
+""" Use example:
+from My_Pack.Essentials import HttpClient
+
+# One shared session, 100 connections per host, 3 retries with exponential backoff
+client = HttpClient(pool_maxsize = 100, retries = 3, timeout = 10, host_pools = {'https://api.example.com': 200})
+
+def fetch(url):
+    return client.get(url).json()
+
+threading.AddThread(fetch, (url,), run = True)
+
+# With a fixed worker pool, one session per worker also avoids contention on the shared pool
+pooled = Threading(workers = 32)
+client = HttpClient(per_thread = True, pool_maxsize = 4)
+"""
+
+USER_AGENT: str = 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
+
+RETRY_STATUSES = (429, 500, 502, 503, 504)
+
+
+class TunedAdapter(HTTPAdapter):
+    """
+        [HTTPAdapter] with a default timeout and optional TCP keep-alive probes on its pooled connections.
+    """
+
+    def __init__(self, timeout: Union[float, tuple, None] = None, tcp_keepalive: int = None, **kwargs):
+        self.timeout = timeout
+        self.tcp_keepalive = tcp_keepalive
+        super().__init__(**kwargs)
+
+    def init_poolmanager(self, *args, **kwargs):
+        if self.tcp_keepalive is not None:
+            kwargs['socket_options'] = HTTPConnection.default_socket_options + keepaliveOptions(self.tcp_keepalive)
+        super().init_poolmanager(*args, **kwargs)
+
+    def send(self, request, timeout = None, **kwargs) -> Response:
+        return super().send(request, timeout = self.timeout if timeout is None else timeout, **kwargs)
+
+
+def keepaliveOptions(idle: int) -> List[tuple]:
+    """ Socket options sending TCP keep-alive probes after [idle] seconds without traffic, where the platform supports it. """
+    options = [(socket.SOL_SOCKET, socket.SO_KEEPALIVE, 1)]
+
+    for name, value in (('TCP_KEEPIDLE', idle), ('TCP_KEEPINTVL', max(1, idle // 3)), ('TCP_KEEPCNT', 3)):
+        if hasattr(socket, name):
+            options.append((socket.IPPROTO_TCP, getattr(socket, name), value))
+
+    return options
+
+def createSession(pool_connections: int = 10, pool_maxsize: int = 10, pool_block: bool = False, retries: int = 0, backoff_factor: float = 0.5,
+                  retry_statuses: Iterable[int] = RETRY_STATUSES, timeout: Union[float, tuple, None] = None, keep_alive: bool = True,
+                  tcp_keepalive: int = None, host_pools: Dict[str, int] = None, headers: Dict[str, str] = None) -> Session:
+    """ Creates a [requests.Session] with tuned connection pools.
+
+    Args:
+        pool_connections (int, optional): Hosts whose connection pools are kept. Defaults to 10.
+        pool_maxsize (int, optional): Connections kept per host. Should be at least the threads sharing the session,
+            or connections get discarded and renegotiated. Defaults to 10.
+        pool_block (bool, optional): True to wait for a free connection instead of opening an extra one. Defaults to False.
+        retries (int, optional): Retries of failed connections and of [retry_statuses] responses, idempotent methods only. Defaults to 0.
+        backoff_factor (float, optional): Sleep [backoff_factor * 2 ** (retry - 1)] seconds between retries. Defaults to 0.5.
+        retry_statuses (Iterable[int], optional): Response statuses worth a retry. Defaults to RETRY_STATUSES.
+        timeout (float | tuple | None, optional): Default timeout of every request, see [requests.request]. Defaults to None.
+        keep_alive (bool, optional): False to close connections after every request. Defaults to True.
+        tcp_keepalive (int, optional): Seconds idle before TCP keep-alive probes, so idle pooled connections survive NATs. Defaults to None.
+        host_pools (Dict[str, int], optional): [pool_maxsize] overrides per URL prefix, e.g. {'https://api.example.com': 200}. Defaults to None.
+        headers (Dict[str, str], optional): Headers added to every request. Defaults to a browser User-Agent.
+
+    Returns:
+        Session: The configured session.
+    """
+
+    if pool_connections < 1 or pool_maxsize < 1:
+        raise ValueError('[pool_connections] and [pool_maxsize] must be at least 1')
+    if retries < 0:
+        raise ValueError('[retries] must be at least 0')
+
+    retry = Retry(total = retries, backoff_factor = backoff_factor, status_forcelist = tuple(retry_statuses), raise_on_status = False) if retries else Retry(0, read = False)
+
+    def adapter(maxsize: int) -> TunedAdapter:
+        return TunedAdapter(timeout = timeout, tcp_keepalive = tcp_keepalive, pool_connections = pool_connections,
+                            pool_maxsize = maxsize, pool_block = pool_block, max_retries = retry)
+
+    session = Session()
+    session.mount('http://', adapter(pool_maxsize))
+    session.mount('https://', adapter(pool_maxsize))
+    for prefix, maxsize in (host_pools or {}).items():
+        session.mount(prefix, adapter(maxsize))
+
+    session.headers.update({'User-Agent': USER_AGENT} if headers is None else headers)
+    if not keep_alive:
+        session.headers['Connection'] = 'close'
+
+    return session
+
+
+class HttpClient(object):
+    """
+        Hands out sessions made by [createSession] with the given options, so threads reuse connections.
+        By default every thread shares one session: size [pool_maxsize] to the threads using it at once.
+        With [per_thread] each thread gets its own session, dropped with the thread. That only pays off for long-lived threads,
+        like [Threading(workers = N)]'s: [Threading]'s default mode starts a new thread per task, so every task would open new connections.
+    """
+
+    def __init__(self, per_thread: bool = False, **options):
+        """
+        Args:
+            per_thread (bool, optional): True for one session per thread, False for a shared one. Defaults to False.
+            **options: See [createSession].
+        """
+        self.per_thread = per_thread
+        self.options = options
+
+        self.__local = local()
+        self.__lock: Lock = Lock()
+        self.__shared: Union[Session, None] = None
+        self.__sessions: weakref.WeakSet = weakref.WeakSet() # Per thread ones, alive while their thread is
+
+        createSession(**options).close() # Checks the options now rather than on the first request
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    # Session of the calling thread, or the shared one.
+    @property
+    def Session(self) -> Session:
+        if self.per_thread:
+            session = getattr(self.__local, 'session', None)
+            if session is None:
+                session = self.__local.session = self.__create()
+            return session
+
+        with self.__lock:
+            if self.__shared is None:
+                self.__shared = createSession(**self.options)
+            return self.__shared
+
+    def request(self, method: str, url: str, **kwargs) -> Response:
+        return self.Session.request(method, url, **kwargs)
+
+    def get(self, url: str, **kwargs) -> Response:
+        return self.request('GET', url, **kwargs)
+
+    def post(self, url: str, **kwargs) -> Response:
+        return self.request('POST', url, **kwargs)
+
+    def put(self, url: str, **kwargs) -> Response:
+        return self.request('PUT', url, **kwargs)
+
+    def delete(self, url: str, **kwargs) -> Response:
+        return self.request('DELETE', url, **kwargs)
+
+    def head(self, url: str, **kwargs) -> Response:
+        return self.request('HEAD', url, **kwargs)
+
+    def close(self):
+        """ Closes every session handed out so far, and their connections. """
+        with self.__lock:
+            sessions = list(self.__sessions) + ([self.__shared] if self.__shared is not None else [])
+            self.__shared, self.__sessions = None, weakref.WeakSet()
+        for session in sessions:
+            session.close()
+
+        self.__local = local()
+
+    def __create(self) -> Session:
+        session = createSession(**self.options)
+        with self.__lock:
+            self.__sessions.add(session)
+        return session
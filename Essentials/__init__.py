@@ -1,11 +1,12 @@
 from My_Pack.System import bruteCls as cls
 from My_Pack.Crypt import generateRandomToken as grt
-from requests import Session as __Session
+from .Http import HttpClient, createSession, USER_AGENT
 from typing import Dict, List, Tuple, Union, Any
 import os, json, sys
 
-rq = __Session()
-rq.headers = {'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'}
+# Shared by every thread: sized for many workers. Use [HttpClient] for retries, timeouts or per thread sessions.
+rq = createSession(pool_maxsize = 100)
+rq.headers = {'User-Agent': USER_AGENT}
 
 def isNone(data) -> bool: return data is None
 def isNotNone(data) -> bool: return not (data is None)
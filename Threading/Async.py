@@ -0,0 +1,241 @@
+import asyncio, functools
+from typing import Any, Awaitable, Callable, Dict, Tuple, Union
+from My_Pack.Essentials import ensureType
+
+""" Use example:
+from My_Pack.Threading import Threading, AsyncTaskGroup
+
+async def main():
+    threading = Threading(workers = 4)
+
+    # Sync work is awaited without blocking the loop
+    thread_id, thread = threading.AddThread(slow_function, (1, 2), run = True)
+    result = await thread
+
+    # Async and sync work sharing one concurrency limit
+    async with AsyncTaskGroup(limit = 10, threading = threading) as group:
+        group.AddTask(fetch('https://...'))
+        group.AddThread(slow_function, (3, 4))
+"""
+
+
+def awaitTask(task, loop: asyncio.AbstractEventLoop = None) -> asyncio.Future:
+    """ Returns an [asyncio.Future] resolved with [task]'s outcome once its target finishes.
+    Completion is pushed into the loop by a done-callback, so nothing polls. The task still has to be started elsewhere.
+
+    Args:
+        task (BaseTask): A [Thread] or [Task] from [My_Pack.Threading].
+        loop (asyncio.AbstractEventLoop, optional): Loop owning the future. Defaults to the running loop.
+
+    Returns:
+        asyncio.Future: Future with the target's return value or raised exception.
+    """
+
+    if loop is None:
+        loop = asyncio.get_running_loop()
+
+    future = loop.create_future()
+
+    def copy(task):
+        if future.cancelled():
+            return
+
+        exception = task.exception()
+        if exception is not None:
+            future.set_exception(exception)
+        else:
+            future.set_result(task.result())
+
+    def notify(task):
+        # Called from whatever thread ran the target
+        try:
+            loop.call_soon_threadsafe(copy, task)
+        except RuntimeError:
+            pass # Loop already closed, nobody is waiting anymore
+
+    task.add_done_callback(notify)
+    return future
+
+
+class AsyncTaskGroup(object):
+    # Dict containing task's id and it's [asyncio.Task]: {0: Task(...), 1: Task(...)}
+    # Not intended to be modified outside.
+    tasks: Dict[int, asyncio.Task] # {task_id: task_obj}
+
+    # Last id on [AsyncTaskGroup.tasks]. Defaults to [-1]
+    # Not intended to be modified outside.
+    lastId: int = -1
+
+    # Maximum tasks running at once, or [None] for no limit.
+    # Not intended to be modified outside.
+    limit: Union[int, None] = None
+
+    # [Threading] used by [AsyncTaskGroup.AddThread] to run sync targets.
+    threading = None
+
+    def __init__(self, limit: Union[int, None] = None, threading = None):
+        """
+            Runs coroutines on the running loop, at most [limit] at once.
+            Sync targets given to [AsyncTaskGroup.AddThread] run on [threading] and count against the same limit.
+
+        Args:
+            limit (int | None, optional): Maximum tasks running at once. Defaults to None.
+            threading (Threading, optional): Scheduler for sync targets. Defaults to None.
+        """
+
+        if limit is not None:
+            ensureType(limit, int, 'limit')
+            if limit < 1:
+                raise ValueError('[limit] must be at least 1')
+
+        self.tasks = {}
+        self.lastId = -1
+        self.limit = limit
+        self.threading = threading
+
+        self.__semaphore: Union[asyncio.Semaphore, None] = None if limit is None else asyncio.Semaphore(limit)
+        self.__running: int = 0
+        self.__complete: int = 0
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb):
+        """
+            Waits for every task, like [asyncio.TaskGroup]: if the body raised, pending tasks are cancelled first and the body's exception propagates.
+            Else the first task (by id) that raised has its exception raised here. Exceptions of the other tasks are retrieved and dropped.
+        """
+        if exc is not None:
+            for task in self.tasks.values():
+                task.cancel()
+
+        await self.WaitAll()
+
+        failures = [task.exception() for task in self.tasks.values() if not task.cancelled()]
+        failures = [failure for failure in failures if failure is not None]
+        if exc is None and failures:
+            raise failures[0]
+
+
+    @property
+    def ThreadCount(self) -> int:
+        """
+            Returns the tasks count, running or not, completed or not.
+
+        Returns:
+            int: How many tasks in [AsyncTaskGroup.tasks].
+        """
+        return len(self.tasks)
+
+    @property
+    def RunningCount(self) -> int:
+        """
+            Returns the running tasks count. Tasks waiting for a free slot are not running.
+
+        Returns:
+            int: How many running tasks in [AsyncTaskGroup.tasks].
+        """
+        return self.__running
+
+    @property
+    def CompleteCount(self) -> int:
+        """
+            Returns the complete tasks count, be it returned, raised or cancelled.
+
+        Returns:
+            int: How many completed tasks in [AsyncTaskGroup.tasks].
+        """
+        return self.__complete
+
+    @property
+    def AllComplete(self) -> bool:
+        """
+            Returns [True] if all tasks in [AsyncTaskGroup.tasks] are complete.
+        """
+        return self.__complete == len(self.tasks)
+
+    def AddTask(self, coroutine: Awaitable) -> Tuple[int, asyncio.Task]:
+        """
+            Schedules [coroutine] on the running loop. It starts as soon as a slot is free.
+
+        Args:
+            coroutine (Awaitable): Coroutine to run.
+
+        Returns:
+            int: Created task id.
+            asyncio.Task: Created task.
+        """
+
+        self.lastId += 1
+        task_id = self.lastId
+
+        task = asyncio.ensure_future(self.__run(coroutine))
+        task.add_done_callback(functools.partial(self.__done, coroutine))
+        self.tasks[task_id] = task
+
+        return (task_id, task)
+
+    def AddThread(self, target: Callable, args: Tuple = (), custom_data: dict = {}, **kwargs) -> Tuple[int, asyncio.Task]:
+        """
+            Runs sync [target] on [AsyncTaskGroup.threading] once a slot is free, awaiting it without blocking the loop.
+            See [Threading.AddThread] for the arguments.
+
+        Raises:
+            ValueError: Raises if the group was created without [threading].
+
+        Returns:
+            int: Created task id.
+            asyncio.Task: Created task, resolving to [target]'s return value.
+        """
+
+        if self.threading is None:
+            raise ValueError('[threading] must be given to run sync targets')
+
+        async def run():
+            thread_id, thread = self.threading.AddThread(target, args, run = True, custom_data = custom_data, **kwargs)
+            return await awaitTask(thread)
+
+        return self.AddTask(run())
+
+    async def WaitAll(self, timeout: Union[float, None] = None) -> bool:
+        """
+            Waits until [AsyncTaskGroup.AllComplete] is [True]. Tasks added while waiting are waited for too.
+
+        Args:
+            timeout (float | None, optional): Maximum time to wait, in seconds. Defaults to None.
+
+        Returns:
+            bool: [True] if all tasks are complete, [False] if [timeout] was reached first.
+        """
+
+        loop = asyncio.get_running_loop()
+        deadline = None if timeout is None else loop.time() + timeout
+
+        while not self.AllComplete:
+            remaining = None if deadline is None else deadline - loop.time()
+            if remaining is not None and remaining <= 0:
+                return False
+
+            await asyncio.wait(list(self.tasks.values()), timeout = remaining)
+
+        return True
+
+    async def __run(self, coroutine: Awaitable) -> Any:
+        if self.__semaphore is None:
+            return await self.__track(coroutine)
+
+        async with self.__semaphore:
+            return await self.__track(coroutine)
+
+    def __done(self, coroutine: Awaitable, task: asyncio.Task):
+        # Also called for tasks cancelled before they started, which never enter [AsyncTaskGroup.__run]
+        self.__complete += 1
+        if task.cancelled() and asyncio.iscoroutine(coroutine):
+            coroutine.close() # No-op if it ran, else silences the never awaited warning
+
+    async def __track(self, coroutine: Awaitable) -> Any:
+        self.__running += 1
+        try:
+            return await coroutine
+        finally:
+            self.__running -= 1
@@ -0,0 +1,208 @@
+import bisect, time
+from collections import deque
+from threading import Lock
+from typing import Any, Deque, Dict, List, NamedTuple, Tuple, Union
+from My_Pack.Essentials import ensureType
+
+""" Use example:
+from My_Pack.Threading import Threading, Profiler
+
+profiler = Profiler(tag = 'host')
+threading = Threading(workers = 8, profiler = profiler)
+threading.AddThread(fetch, (url,), custom_data = {'host': 'example.com'}, run = True)
+threading.WaitAll()
+
+profiler.AsDict()['example.com']['run']['p99'] # Seconds
+print(profiler.AsPrometheus())
+"""
+
+""" Phases:
+    setup: time spent inside [Threading.AddThread], argument inspection and thread creation included.
+    wait: from [Threading.StartThread] until the target starts running (queue wait, or OS thread start).
+    run: target's own run time.
+    join: from the target returning until the thread is marked complete.
+"""
+
+PHASES: Tuple[str, ...] = ('setup', 'wait', 'run', 'join')
+
+# Upper bounds, in seconds, of the histogram buckets. The last one catches everything.
+DEFAULT_BUCKETS: Tuple[float, ...] = (0.0001, 0.00025, 0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60, float('inf'))
+
+
+class TaskProfile(NamedTuple):
+    """
+        Phase durations of one thread, in seconds. [None] if the phase did not happen (e.g. cancelled before running).
+    """
+    thread_id: int
+    tag: str
+    setup: Union[float, None]
+    wait: Union[float, None]
+    run: Union[float, None]
+    join: Union[float, None]
+
+
+class Histogram(object):
+    """
+        Fixed buckets histogram. Percentiles are interpolated inside the bucket they fall in.
+    """
+
+    def __init__(self, buckets: Tuple[float, ...] = DEFAULT_BUCKETS):
+        self.buckets = buckets
+        self.counts: List[int] = [0] * len(buckets)
+        self.count: int = 0
+        self.sum: float = 0
+        self.min: Union[float, None] = None
+        self.max: Union[float, None] = None
+
+    def add(self, value: float):
+        self.counts[min(bisect.bisect_left(self.buckets, value), len(self.buckets) - 1)] += 1
+        self.count += 1
+        self.sum += value
+        self.min = value if self.min is None else min(self.min, value)
+        self.max = value if self.max is None else max(self.max, value)
+
+    def percentile(self, q: float) -> Union[float, None]:
+        """
+            Returns the estimated [q] percentile (0 to 100), or [None] if empty.
+        """
+        if self.count == 0:
+            return None
+
+        rank = q / 100 * self.count
+        seen = 0
+        for pos, count in enumerate(self.counts):
+            if count and seen + count >= rank:
+                low = self.min if pos == 0 else max(self.buckets[pos - 1], self.min)
+                high = min(self.buckets[pos], self.max)
+                return low + (high - low) * ((rank - seen) / count)
+            seen += count
+
+        return self.max
+
+    def asDict(self) -> Dict[str, Any]:
+        cumulative, buckets = 0, {}
+        for bound, count in zip(self.buckets, self.counts):
+            cumulative += count
+            buckets[bound] = cumulative
+
+        return {
+            'count': self.count,
+            'sum': self.sum,
+            'min': self.min,
+            'max': self.max,
+            'p50': self.percentile(50),
+            'p90': self.percentile(90),
+            'p99': self.percentile(99),
+            'buckets': buckets
+        }
+
+
+class Profiler(object):
+    """
+        Opt-in instrumentation for [Threading]. Records each thread's phase durations (see [PHASES])
+        and aggregates them in one [Histogram] per [custom_data[tag]] and phase.
+        A [Threading] without a profiler only pays a few [None] checks.
+    """
+
+    # Last [keep] per thread profiles, oldest first.
+    # Not intended to be modified outside.
+    records: Deque[TaskProfile]
+
+    def __init__(self, tag: str = 'tag', buckets: Tuple[float, ...] = DEFAULT_BUCKETS, keep: int = 1000):
+        """
+        Args:
+            tag (str, optional): [custom_data] key to group threads by. Threads without it are grouped as 'untagged'. Defaults to 'tag'.
+            buckets (Tuple[float, ...], optional): Histogram buckets upper bounds, in seconds. Defaults to DEFAULT_BUCKETS.
+            keep (int, optional): How many per thread profiles to keep in [Profiler.records]. Defaults to 1000.
+        """
+
+        ensureType(tag, str, 'tag')
+        ensureType(keep, int, 'keep')
+
+        self.tag = tag
+        self.buckets = tuple(sorted(buckets)) if buckets[-1] == float('inf') else tuple(sorted(buckets)) + (float('inf'),)
+        self.records = deque(maxlen = keep)
+
+        self.__lock: Lock = Lock()
+        self.__marks: Dict[int, Dict[str, Any]] = {} # {thread_id: {'tag': ..., event: perf_counter()}}
+        self.__histograms: Dict[str, Dict[str, Histogram]] = {} # {tag: {phase: histogram}}
+
+    def _added(self, thread_id: int, custom_data: dict, created: float):
+        """
+            Called by [Threading.AddThread] once the thread exists. [created] is [time.perf_counter()] at [AddThread]'s start.
+        """
+        tag = custom_data.get(self.tag)
+        with self.__lock:
+            self.__marks[thread_id] = {'tag': 'untagged' if tag is None else str(tag), 'created': created, 'added': time.perf_counter()}
+
+    def _mark(self, thread_id: int, event: str):
+        """
+            Stamps [event] ('start', 'running' or 'done') for [thread_id].
+        """
+        now = time.perf_counter()
+        with self.__lock:
+            marks = self.__marks.get(thread_id)
+            if marks is not None:
+                marks[event] = now
+
+    def _complete(self, thread_id: int):
+        """
+            Called when [thread_id] is marked complete: turns its stamps into a [TaskProfile].
+        """
+        now = time.perf_counter()
+        with self.__lock:
+            marks = self.__marks.pop(thread_id, None)
+            if marks is None:
+                return
+
+            marks['complete'] = now
+            span = lambda start, end: (marks[end] - marks[start]) if start in marks and end in marks else None
+            profile = TaskProfile(thread_id, marks['tag'], span('created', 'added'), span('start', 'running'), span('running', 'done'), span('done', 'complete'))
+
+            histograms = self.__histograms.setdefault(profile.tag, {})
+            for phase in PHASES:
+                value = getattr(profile, phase)
+                if value is not None:
+                    if phase not in histograms:
+                        histograms[phase] = Histogram(self.buckets)
+                    histograms[phase].add(value)
+
+            self.records.append(profile)
+
+    def Reset(self):
+        """
+            Drops every aggregated histogram and per thread profile. Threads in flight keep being tracked.
+        """
+        with self.__lock:
+            self.__histograms = {}
+            self.records.clear()
+
+    def AsDict(self) -> Dict[str, Dict[str, Dict[str, Any]]]:
+        """
+            Returns the aggregates as {tag: {phase: {'count', 'sum', 'min', 'max', 'p50', 'p90', 'p99', 'buckets'}}}.
+            [buckets] maps each upper bound to the cumulative count, in seconds.
+        """
+        with self.__lock:
+            return {tag: {phase: histogram.asDict() for phase, histogram in phases.items()} for tag, phases in self.__histograms.items()}
+
+    def AsPrometheus(self, name: str = 'threading_task_seconds') -> str:
+        """
+            Returns the aggregates in Prometheus' text exposition format, as one histogram labelled by tag and phase.
+        """
+        ensureType(name, str, 'name')
+
+        lines = [f'# HELP {name} Time spent by Threading tasks in each phase.', f'# TYPE {name} histogram']
+        escape = lambda value: value.replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+        for tag, phases in self.AsDict().items():
+            for phase, data in phases.items():
+                labels = f'tag="{escape(tag)}",phase="{phase}"'
+
+                for bound, count in data['buckets'].items():
+                    le = '+Inf' if bound == float('inf') else repr(float(bound))
+                    lines.append(f'{name}_bucket{{{labels},le="{le}"}} {count}')
+
+                lines.append(f'{name}_sum{{{labels}}} {data["sum"]}')
+                lines.append(f'{name}_count{{{labels}}} {data["count"]}')
+
+        return '\n'.join(lines) + '\n'
@@ -0,0 +1,232 @@
+import heapq, itertools, time
+from queue import Empty
+from threading import Condition
+from typing import Any, Dict, List, Tuple, Union
+from My_Pack.Essentials import ensureType
+
+""" Use example:
+from My_Pack.Threading import Threading, Scheduler
+
+# 20 requests/s overall, 2 requests/s and at most 4 connections per host
+scheduler = Scheduler(rate = 20, burst = 20, key = 'host', key_rate = 2, key_concurrency = 4)
+scheduler.SetLimit('api.example.com', rate = 10, burst = 10, concurrency = 8)
+
+threading = Threading(workers = 32, scheduler = scheduler)
+threading.AddThread(fetch, (url,), custom_data = {'host': 'api.example.com'}, priority = -1)
+threading.StartAll()
+"""
+
+
+class TokenBucket(object):
+    """
+        Classic token bucket: holds up to [burst] tokens, refilled at [rate] tokens per second.
+        Not thread safe by itself, [Scheduler] guards it.
+    """
+
+    def __init__(self, rate: float, burst: float = 1):
+        if rate <= 0:
+            raise ValueError('[rate] must be greater than 0')
+        if burst < 1:
+            raise ValueError('[burst] must be at least 1')
+
+        self.rate = rate
+        self.burst = burst
+        self.tokens = burst
+        self.stamp = time.monotonic()
+
+    def delay(self, now: float) -> float:
+        """
+            Returns how many seconds until a token is available, [0] if one already is.
+        """
+        self.__refill(now)
+        return 0 if self.tokens >= 1 else (1 - self.tokens) / self.rate
+
+    def take(self, now: float):
+        self.__refill(now)
+        self.tokens -= 1
+
+    def __refill(self, now: float):
+        self.tokens = min(self.burst, self.tokens + (now - self.stamp) * self.rate)
+        self.stamp = now
+
+
+class Scheduler(object):
+    """
+        Queue feeding [Threading]'s worker pool. Hands out the most urgent task (lowest [Task.priority], then oldest)
+        that is allowed to run right now, according to:
+            - a global token bucket ([rate], [burst]);
+            - a token bucket per key ([key_rate], [key_burst]), the key being [task.CustomData[key]];
+            - a maximum of running tasks per key ([key_concurrency]).
+
+        Tasks without the key in their [custom_data] are only subject to the global limit.
+        Per key limits can be overridden with [Scheduler.SetLimit].
+    """
+
+    def __init__(self, rate: float = None, burst: int = 1, key: str = None, key_rate: float = None, key_burst: int = 1, key_concurrency: int = None):
+        if key is not None:
+            ensureType(key, str, 'key')
+        if key_concurrency is not None:
+            ensureType(key_concurrency, int, 'key_concurrency')
+
+        self.key = key
+
+        self.__condition: Condition = Condition()
+        self.__bucket: Union[TokenBucket, None] = None if rate is None else TokenBucket(rate, burst)
+        self.__default: Tuple[float, int, int] = (key_rate, key_burst, key_concurrency)
+        self.__limits: Dict[Any, Tuple[float, int, int]] = {}
+
+        self.__queues: Dict[Any, List[Tuple[int, int, Any]]] = {} # {key: heap of (priority, sequence, task)}
+        self.__buckets: Dict[Any, TokenBucket] = {}
+        self.__active: Dict[Any, int] = {}
+        self.__sequence = itertools.count()
+        self.__size: int = 0
+        self.__sentinels: int = 0
+
+    def SetLimit(self, key: Any, rate: float = None, burst: int = 1, concurrency: int = None):
+        """
+            Overrides the default per key limits for [key]. [None] means unlimited.
+        """
+        with self.__condition:
+            self.__limits[key] = (rate, burst, concurrency)
+            self.__buckets.pop(key, None)
+            self.__condition.notify_all()
+
+    def qsize(self) -> int:
+        """
+            Returns how many tasks are waiting to run.
+        """
+        return self.__size
+
+    def put(self, task):
+        """
+            Queues [task]. [None] is a stop signal for one worker, handed out only once no task is left.
+        """
+        with self.__condition:
+            if task is None:
+                self.__sentinels += 1
+
+            else:
+                key = self.__keyOf(task)
+                heapq.heappush(self.__queues.setdefault(key, []), (task.priority, next(self.__sequence), task))
+                self.__size += 1
+
+            self.__condition.notify_all()
+
+    def get(self, block: bool = True):
+        """
+            Removes and returns the most urgent task allowed to run, waiting for rate limits and free slots if needed.
+            Tasks cancelled while queued are completed on the way, without using up rate limits or slots.
+
+        Raises:
+            Empty: Raises if [block] is [False] and no task can run right now.
+
+        Returns:
+            Task | None: A task, or [None] if asked to stop.
+        """
+        while True:
+            skipped = []
+            with self.__condition:
+                while True:
+                    task, delay = self.__pop(time.monotonic(), skipped)
+                    if task is not None or skipped:
+                        break
+
+                    if self.__size == 0 and self.__sentinels > 0:
+                        self.__sentinels -= 1
+                        return None
+
+                    if not block:
+                        raise Empty
+
+                    self.__condition.wait(delay)
+
+            # Completed out of the lock, their state hooks may take [Threading]'s
+            for cancelled in skipped:
+                cancelled._skipIfCancelled()
+
+            if task is not None:
+                return task
+
+    def get_nowait(self):
+        return self.get(block = False)
+
+    def release(self, task):
+        """
+            Tells the scheduler [task] is done, freeing its key's concurrency slot.
+        """
+        with self.__condition:
+            key = self.__keyOf(task)
+            self.__active[key] -= 1
+            if self.__active[key] == 0:
+                del self.__active[key]
+
+            self.__condition.notify_all()
+
+    def __keyOf(self, task) -> Any:
+        if self.key is None:
+            return None
+        return task.CustomData.get(self.key)
+
+    def __keyBucket(self, key: Any, rate: float, burst: int) -> TokenBucket:
+        if key not in self.__buckets:
+            self.__buckets[key] = TokenBucket(rate, burst)
+        return self.__buckets[key]
+
+    def __pop(self, now: float, skipped: List[Any]) -> Tuple[Any, Union[float, None]]:
+        """
+            Must be called holding [Scheduler.__condition].
+            Cancelled tasks at the front of a queue are moved to [skipped] first, spending no token or slot. The caller completes them.
+
+        Returns:
+            Tuple[Task | None, float | None]: The dispatched task, or [None] and how long until a rate limit may allow one.
+                A [None] delay means only a release or a put can change anything.
+        """
+        best = None
+        found = False # Keys can be [None], so [best] alone can't tell
+        delays = []
+
+        for key in list(self.__queues):
+            heap = self.__queues[key]
+            while heap and heap[0][2].token.IsCancelled:
+                skipped.append(heapq.heappop(heap)[2])
+                self.__size -= 1
+            if not heap:
+                del self.__queues[key]
+                continue
+
+            if key is not None:
+                rate, burst, concurrency = self.__limits.get(key, self.__default)
+
+                if concurrency is not None and self.__active.get(key, 0) >= concurrency:
+                    continue
+
+                if rate is not None:
+                    delay = self.__keyBucket(key, rate, burst).delay(now)
+                    if delay > 0:
+                        delays.append(delay)
+                        continue
+
+            if not found or heap[0] < self.__queues[best][0]:
+                best = key
+                found = True
+
+        if not found:
+            return (None, min(delays) if delays else None)
+
+        if self.__bucket is not None:
+            delay = self.__bucket.delay(now)
+            if delay > 0:
+                return (None, delay)
+            self.__bucket.take(now)
+
+        if best in self.__buckets:
+            self.__buckets[best].take(now)
+
+        heap = self.__queues[best]
+        _, _, task = heapq.heappop(heap)
+        if not heap:
+            del self.__queues[best]
+
+        self.__size -= 1
+        self.__active[best] = self.__active.get(best, 0) + 1
+        return (task, None)
@@ -1,20 +1,140 @@
-from threading import Event, Thread as __Thread
-from typing import Callable, Dict, Tuple, Union
+from threading import Condition, Event, Lock, Semaphore, Thread as __Thread
+from collections import OrderedDict
+from concurrent.futures import Future, ProcessPoolExecutor
+from queue import Queue, Empty
+from typing import Any, Callable, Dict, Iterable, Iterator, List, NamedTuple, Tuple, Union
 from My_Pack.Essentials import ensureType
-import sys, inspect
+from .Async import AsyncTaskGroup, awaitTask
+from .Scheduler import Scheduler, TokenBucket
+from .Profiler import Profiler, TaskProfile
+import asyncio, functools, heapq, itertools, os, sys, inspect, time, traceback, weakref
 
 class NotStartedException(Exception):
     pass
 
-class Thread(__Thread):
-    def __init__(self, target: Callable, args: Tuple = (), custom_data: dict = {}, **kwargs):
-        ensureType(args, tuple, 'args')
-        ensureType(custom_data, dict, 'custom_data')
-        
-        super().__init__(target = target, args = args, **kwargs)
+class CancelledException(Exception):
+    pass
 
-        self.Start = self.start # Backwards compat
-        self.Join = self.join # Backwards compat
+class TimedOutException(CancelledException):
+    pass
+
+class CancellationToken(object):
+    """
+        Cooperative cancellation flag handed to targets as kwargs['cancel_token'].
+        Nothing is killed: long running targets should check [CancellationToken.IsCancelled], call [CancellationToken.raiseIfCancelled]
+        between steps, or sleep with [CancellationToken.wait] so they wake up as soon as they are cancelled.
+    """
+
+    def __init__(self):
+        self.__event: Event = Event()
+        self.__exception: Union[CancelledException, None] = None
+
+    # [True] once [CancellationToken.cancel] was called, else [False].
+    @property
+    def IsCancelled(self) -> bool:
+        return self.__event.is_set()
+
+    # Why it was cancelled: a [TimedOutException] if its deadline passed, else a [CancelledException]. [None] if not cancelled.
+    @property
+    def exception(self) -> Union[CancelledException, None]:
+        return self.__exception
+
+    def cancel(self, exception: CancelledException = None):
+        """
+            Asks the target to stop. Only the first call has effect.
+
+        Args:
+            exception (CancelledException, optional): Reason, raised by [CancellationToken.raiseIfCancelled]. Defaults to a plain [CancelledException].
+        """
+        if self.__event.is_set():
+            return
+
+        self.__exception = CancelledException('Task was cancelled') if exception is None else exception
+        self.__event.set()
+
+    def wait(self, timeout: Union[float, None] = None) -> bool:
+        """
+            Sleeps up to [timeout] seconds, waking up early if cancelled.
+
+        Returns:
+            bool: [True] if cancelled, else [False].
+        """
+        return self.__event.wait(timeout)
+
+    def raiseIfCancelled(self):
+        """
+        Raises:
+            CancelledException: Raises the cancellation reason if cancelled.
+        """
+        if self.__event.is_set():
+            raise self.__exception
+
+def _runChunk(chunk: List[Tuple[Callable, Tuple, dict]]) -> List[Tuple[Any, Union[BaseException, None]]]:
+    """
+        Runs a chunk of targets inside a worker process. See [Threading.__dispatcher].
+        Module level so it can be pickled.
+
+    Returns:
+        List[Tuple[Any, BaseException | None]]: [(result, exception)] for each target, in order.
+    """
+    outcomes = []
+    for target, args, kwargs in chunk:
+        try:
+            outcomes.append((target(*args, **kwargs), None))
+        except Exception as ex:
+            outcomes.append((None, ex))
+    return outcomes
+
+class TaskSummary(NamedTuple):
+    """
+        What is left of a thread retired by a [Retention] policy. See [Threading.retired].
+    """
+    thread_id: int
+    finished_at: float # [time.time()] when it completed
+    cancelled: bool
+    timed_out: bool
+    error: Union[str, None] # [repr] of the exception raised by the target, if any
+
+class Retention(object):
+    """
+        Retention policy for completed threads, so long-lived [Threading] instances run in constant memory.
+        Retired threads are removed from [Threading.threads] (and from the counters), leaving a [TaskSummary] in [Threading.retired].
+        Running and not started threads are never retired.
+    """
+
+    def __init__(self, keep_last: int = None, keep_for: float = None, drop_on_result: bool = False, summaries: int = 1000):
+        """
+        Args:
+            keep_last (int, optional): Keep at most this many completed threads, retiring the oldest. Defaults to None.
+            keep_for (float, optional): Retire completed threads this many seconds after they complete. Defaults to None.
+            drop_on_result (bool, optional): Retire threads as soon as their result is consumed through
+                [Threading.Result] or [Threading.AsCompleted]. Defaults to False.
+            summaries (int, optional): Maximum [TaskSummary]s kept in [Threading.retired], oldest dropped first. Defaults to 1000.
+        """
+
+        if keep_last is not None:
+            ensureType(keep_last, int, 'keep_last')
+            if keep_last < 0:
+                raise ValueError('[keep_last] must be at least 0')
+
+        if keep_for is not None and keep_for < 0:
+            raise ValueError('[keep_for] must be at least 0')
+
+        ensureType(drop_on_result, bool, 'drop_on_result')
+        ensureType(summaries, int, 'summaries')
+
+        self.keep_last = keep_last
+        self.keep_for = keep_for
+        self.drop_on_result = drop_on_result
+        self.summaries = summaries
+
+class BaseTask(object):
+    """
+        State shared by every unit of work tracked by [Threading], be it a [Thread] or a pooled [Task].
+    """
+
+    def __init__(self, custom_data: dict = {}, token: CancellationToken = None, timeout: Union[float, None] = None, **kwargs):
+        super().__init__(**kwargs)
 
         # [True] if thread is still running, else [False].
         # Read only.
@@ -31,23 +151,222 @@ class Thread(__Thread):
         ## >>> th.CustomData
         ## {'test': 123}
         self.__custom_data: dict = custom_data
+
+        # Cooperative cancellation, see [CancellationToken]. [Threading] cancels it with a [TimedOutException]
+        # once [timeout] seconds passed since the thread was started.
+        # Read only.
+        self.token: CancellationToken = CancellationToken() if token is None else token
+        self.timeout: Union[float, None] = timeout
+
+        # Future-like outcome of the target, filled by [BaseTask.run]. See [BaseTask.result] and [BaseTask.exception].
+        self.__done: Event = Event()
+        self.__result: Any = None
+        self.__exception: Union[BaseException, None] = None
+        self.__callbacks: List[Callable] = []
+        self.__callbacksLock: Lock = Lock()
+
+        # Called as [hook(task, (was_running, was_complete), (is_running, is_complete))] on every state change.
+        # Lets [Threading] keep its counters up to date without scanning [Threading.threads]. See [BaseTask._setStateHook].
+        self.__stateHook: Union[Callable, None] = None
+        self.__stateLock: Lock = Lock()
+
+        # Called by [BaseTask.run] right before the target, in the thread running it. Used by [Profiler].
+        self._runHook: Union[Callable, None] = None
     
 
-    # See [Thread.running_]
+    # See [BaseTask.running_]
     @property
     def IsRunning(self) -> bool:
         return self.running_.is_set()
     
-    # See [Thread.complete_]
+    # See [BaseTask.complete_]
     @property
     def IsComplete(self) -> bool:
         return self.complete_.is_set()
     
-    # See [Thread.__custom_data]
+    # See [BaseTask.__custom_data]
     @property
     def CustomData(self):
         return self.__custom_data
 
+    # [True] if [BaseTask.token] was cancelled, for any reason. The target may still be running, see [BaseTask.IsRunning].
+    @property
+    def IsCancelled(self) -> bool:
+        return self.token.IsCancelled
+
+    # [True] if [BaseTask.token] was cancelled because the thread's deadline passed.
+    @property
+    def IsTimedOut(self) -> bool:
+        return isinstance(self.token.exception, TimedOutException)
+
+    def cancel(self):
+        """
+            Asks the target to stop, through [BaseTask.token]. If it did not start yet, it never will.
+        """
+        self.token.cancel()
+
+    def _skipIfCancelled(self) -> bool:
+        """
+            If cancelled before running, completes the task with the cancellation reason as its exception, without calling the target.
+
+        Returns:
+            bool: [True] if skipped, else [False].
+        """
+        if not self.token.IsCancelled:
+            return False
+
+        self._finish(exception = self.token.exception)
+        self._setState(running = False, complete = True)
+        return True
+
+    def _setState(self, running: bool, complete: bool):
+        """
+            Updates [BaseTask.running_] and [BaseTask.complete_] together, reporting the change to the state hook.
+        """
+        with self.__stateLock:
+            before = (self.running_.is_set(), self.complete_.is_set())
+
+            if complete:
+                self.complete_.set()
+            else:
+                self.complete_.clear()
+
+            if running:
+                self.running_.set()
+            else:
+                self.running_.clear()
+
+            if self.__stateHook is not None and before != (running, complete):
+                self.__stateHook(self, before, (running, complete))
+
+    def _setStateHook(self, hook: Union[Callable, None]) -> Tuple[bool, bool]:
+        """
+            Replaces the state hook. See [BaseTask.__stateHook].
+
+        Returns:
+            Tuple[bool, bool]: [running_] and [complete_] states at the moment the hook was replaced.
+        """
+        with self.__stateLock:
+            self.__stateHook = hook
+            return (self.running_.is_set(), self.complete_.is_set())
+
+    def run(self):
+        """
+            Calls the target, keeping its return value or raised exception instead of discarding them.
+            Done-callbacks are called right after, in the thread that ran the target.
+        """
+        result, exception = None, None
+        try:
+            if self._runHook is not None:
+                self._runHook()
+            if self._target is not None:
+                result = self._target(*self._args, **self._kwargs)
+
+        except Exception as ex:
+            exception = ex
+        finally:
+            self._finish(result, exception)
+
+    def done(self) -> bool:
+        """
+            Returns [True] if the target has returned or raised, else [False].
+        """
+        return self.__done.is_set()
+
+    def result(self, timeout: Union[float, None] = None) -> Any:
+        """
+            Waits for the target to finish and returns its return value.
+
+        Args:
+            timeout (float | None, optional): Maximum time to wait, in seconds. Defaults to None.
+
+        Raises:
+            TimeoutError: Raises if the target did not finish in [timeout] seconds.
+            Exception: Re-raises the exception raised by the target, if any.
+
+        Returns:
+            Any: Target's return value.
+        """
+        if not self.__done.wait(timeout):
+            raise TimeoutError(f'Target did not finish in {timeout} seconds')
+
+        if self.__exception is not None:
+            raise self.__exception
+        return self.__result
+
+    def exception(self, timeout: Union[float, None] = None) -> Union[BaseException, None]:
+        """
+            Waits for the target to finish and returns the exception it raised.
+
+        Args:
+            timeout (float | None, optional): Maximum time to wait, in seconds. Defaults to None.
+
+        Raises:
+            TimeoutError: Raises if the target did not finish in [timeout] seconds.
+
+        Returns:
+            BaseException | None: Exception raised by the target, or [None] if it returned normally.
+        """
+        if not self.__done.wait(timeout):
+            raise TimeoutError(f'Target did not finish in {timeout} seconds')
+
+        return self.__exception
+
+    def add_done_callback(self, fn: Callable):
+        """
+            Calls [fn(task)] once the target finishes. If it already did, [fn] is called immediately.
+            Exceptions raised by [fn] are printed and ignored.
+
+        Args:
+            fn (Callable): Function receiving this task as its only argument.
+        """
+        with self.__callbacksLock:
+            if not self.__done.is_set():
+                self.__callbacks.append(fn)
+                return
+
+        self.__callback(fn)
+
+    def __await__(self):
+        """
+            Allows [await thread] inside a coroutine, without blocking the event loop. See [awaitTask].
+        """
+        return awaitTask(self).__await__()
+
+    def _finish(self, result: Any = None, exception: Union[BaseException, None] = None):
+        """
+            Stores the target's outcome and calls the done-callbacks.
+            Called by [BaseTask.run], or by [Threading] when the target ran in another process.
+        """
+        self.__result = result
+        self.__exception = exception
+
+        # Same as [threading.Thread.run]: avoid a refcycle if the target has an argument that points to the task.
+        del self._target, self._args, self._kwargs
+
+        with self.__callbacksLock:
+            self.__done.set()
+            callbacks, self.__callbacks = self.__callbacks, []
+
+        for fn in callbacks:
+            self.__callback(fn)
+
+    def __callback(self, fn: Callable):
+        try:
+            fn(self)
+        except Exception:
+            traceback.print_exc()
+
+class Thread(BaseTask, __Thread):
+    def __init__(self, target: Callable, args: Tuple = (), custom_data: dict = {}, **kwargs):
+        ensureType(args, tuple, 'args')
+        ensureType(custom_data, dict, 'custom_data')
+        
+        super().__init__(custom_data = custom_data, target = target, args = args, **kwargs)
+
+        self.Start = self.start # Backwards compat
+        self.Join = self.join # Backwards compat
+
     def start(self):
         """
             Starts the thread. Will not join it.
@@ -57,8 +376,7 @@ class Thread(__Thread):
         """
         try:
             super().start()
-            self.complete_.clear()
-            self.running_.set()
+            self._setState(running = True, complete = False)
 
         except (KeyboardInterrupt, SystemExit):
             sys.exit()
@@ -70,44 +388,193 @@ class Thread(__Thread):
             Will join previously started thread (use [Thread.Start]).
 
         Args:
-            timeout (float | None, optional): Timeout of thread. Will kill it if thread's running time reach [timeout]. Defaults to None.
+            timeout (float | None, optional): Maximum time to wait, in seconds. The thread is not stopped when it is reached:
+                it keeps running, and so is still reported by [Thread.IsRunning]. Use [BaseTask.cancel] to ask it to stop. Defaults to None.
         """
         super().join(timeout = timeout)
-        self.complete_.set()
-        self.running_.clear()
+        if not self.is_alive():
+            self._setState(running = False, complete = True)
     
     def startAndJoin(self, timeout: Union[float, None] = None):
+        """
+            Starts the thread and waits for it. If [timeout] is reached, [BaseTask.token] is cancelled with a [TimedOutException]
+            and it keeps waiting for the target to stop.
+        """
         try:
+            if self._skipIfCancelled():
+                return
+
             super().start()
-            self.complete_.clear()
-            self.running_.set()
+            self._setState(running = True, complete = False)
             super().join(timeout = timeout)
-            self.complete_.set()
-            self.running_.clear()
+
+            if self.is_alive():
+                self.token.cancel(TimedOutException(f'Thread did not finish in {timeout} seconds'))
+                super().join()
+            self._setState(running = False, complete = True)
 
         except (KeyboardInterrupt, SystemExit):
             sys.exit()
         except Exception as ex:
-            self.complete_.clear()
-            self.running_.clear()
+            self._setState(running = False, complete = False)
             raise ex
 
+class Task(BaseTask):
+    """
+        Unit of work ran by a [Threading] worker pool. Mirrors [Thread]'s interface, but does not own an OS thread:
+        one of [Threading]'s long-lived workers calls [Task.startAndJoin] once the task reaches the front of the queue.
+    """
+
+    def __init__(self, target: Callable, args: Tuple = (), custom_data: dict = {}, kwargs: dict = None, name: str = None, daemon: bool = None, priority: int = 0,
+                 token: CancellationToken = None, timeout: Union[float, None] = None):
+        ensureType(args, tuple, 'args')
+        ensureType(custom_data, dict, 'custom_data')
+        ensureType(priority, int, 'priority')
+
+        super().__init__(custom_data = custom_data, token = token, timeout = timeout)
+
+        self._target = target
+        self._args = args
+        self._kwargs = {} if kwargs is None else kwargs
+        self.name = name
+
+        # Scheduling priority, lower runs first. See [Scheduler].
+        # Read only.
+        self.priority: int = priority
+
+        # [True] once the task was handed to a worker queue, else [False]. A task can only be queued once.
+        # Read only.
+        self.queued_: Event = Event()
+
+        self.Join = self.join # Backwards compat
+
+    def join(self, timeout: Union[float, None] = None):
+        """
+            Waits until the task has completed its work.
+
+        Args:
+            timeout (float | None, optional): Maximum time to wait, in seconds. Defaults to None.
+        """
+        self.complete_.wait(timeout)
+
+    def startAndJoin(self):
+        """
+            Runs the task in the calling thread, updating [Task.running_] and [Task.complete_] along the way.
+            Exceptions raised by the target are kept by [BaseTask.run], so the calling worker survives them.
+            If the task was cancelled while queued, the target is not called.
+        """
+        if self._skipIfCancelled():
+            return
+
+        self._setState(running = True, complete = False)
+        try:
+            self.run()
+
+        except (KeyboardInterrupt, SystemExit):
+            sys.exit()
+        finally:
+            self._setState(running = False, complete = True)
+
 class Threading(object):
     # Dict containing thread's id and it's object: {0: Thread(...), 1: Thread(...)}
     # Not intended to be modified outside.
-    # Can be used to iterate over threads
-    threads: Dict[int, Thread] # {thread_id: thread_obj}
+    # With [Threading.retention], threads are removed from other threads as they complete: iterate over [Threading.Snapshot] instead
+    threads: Dict[int, Union[Thread, Task]] # {thread_id: thread_obj}
 
     # Last id on [Threading.threads]. Defaults to [-1]
     # Not intended to be modified outside.
     lastId: int = -1
 
-    # If thread target supports key-arguments, it will pass this [Threading] [self] object as kwargs['threading_obj']
-    # and it own id as kwargs['thread_id']
+    # Summaries of threads removed by [Threading.retention], oldest first: {thread_id: TaskSummary(...)}
+    # Not intended to be modified outside.
+    retired: Dict[int, TaskSummary] # {thread_id: summary}
+
+    # Policy retiring completed threads, or [None] to keep them until [Threading.DeleteThread].
+    # Not intended to be modified outside.
+    retention: Union[Retention, None] = None
+
+    # Per thread latency instrumentation, or [None] to disable it.
+    # Not intended to be modified outside.
+    profiler: Union[Profiler, None] = None
+
+    # If thread target supports key-arguments, it will pass this [Threading] [self] object as kwargs['threading_obj'],
+    # it own id as kwargs['thread_id'] and its [CancellationToken] as kwargs['cancel_token']
+
+    # Worker pool size. If [None], every thread is its own [Thread] (plus a follower thread, see [Threading.__followThread]).
+    # Else, threads are created as [Task]s and ran by [workers] long-lived threads pulling from a queue.
+    # Not intended to be modified outside.
+    workers: Union[int, None] = None
+
+    # Where pooled tasks run: 'thread' for worker threads, 'process' for worker processes (CPU-bound work, no GIL contention).
+    # With 'process', targets, args, results and [custom_data] must be picklable, and targets do not receive kwargs['threading_obj'].
+    # Not intended to be modified outside.
+    backend: str = 'thread'
+
+    # How many queued tasks are sent to a worker process at once, amortizing pickling overhead. Only used by the 'process' backend.
+    # Not intended to be modified outside.
+    chunksize: int = 1
+
+    def __init__(self, workers: Union[int, None] = None, backend: str = 'thread', chunksize: int = 1, scheduler: Scheduler = None, retention: Retention = None,
+                 profiler: Profiler = None):
+        ensureType(backend, str, 'backend')
+        ensureType(chunksize, int, 'chunksize')
+        if scheduler is not None:
+            ensureType(scheduler, Scheduler, 'scheduler')
+        if retention is not None:
+            ensureType(retention, Retention, 'retention')
+        if profiler is not None:
+            ensureType(profiler, Profiler, 'profiler')
+
+        if backend not in ('thread', 'process'):
+            raise ValueError(f'[backend] must be \'thread\' or \'process\', but got \'{backend}\'')
+
+        if chunksize < 1:
+            raise ValueError('[chunksize] must be at least 1')
+
+        if workers is None and backend == 'process':
+            workers = os.cpu_count() or 1
+
+        if workers is not None:
+            ensureType(workers, int, 'workers')
+            if workers < 1:
+                raise ValueError('[workers] must be at least 1')
+
+        elif scheduler is not None:
+            raise ValueError('[scheduler] needs a worker pool, set [workers]')
 
-    def __init__(self):
         self.threads = {}
         self.lastId = -1
+        self.workers = workers
+        self.backend = backend
+        self.chunksize = chunksize
+        self.retired = OrderedDict()
+        self.retention = retention
+        self.profiler = profiler
+
+        # Pooled tasks wait here. Without a [scheduler], it is a plain priority queue.
+        self.__queue: Scheduler = Scheduler() if scheduler is None else scheduler
+        self.__pool: List[Thread] = []
+        self.__poolLock: Lock = Lock()
+
+        # Counters kept up to date by [Threading.__onStateChange], guarded by [Threading.__condition].
+        # [__completions] only ever grows, so [Threading.WaitAny] can tell a new completion apart.
+        self.__condition: Condition = Condition()
+        self.__running: int = 0
+        self.__complete: int = 0
+        self.__completions: int = 0
+
+        # Completed thread ids and their [time.monotonic()] and [time.time()] of completion, oldest first, candidates for [Threading.retention].
+        # Threads whose result was consumed before they were marked complete wait in [__dropOnComplete].
+        # Guarded by [Threading.__condition].
+        self.__finished: OrderedDict = OrderedDict() # {thread_id: (monotonic, wall clock)}
+        self.__dropOnComplete: set = set()
+        self.__retiredCount: int = 0
+
+        # Heap of (deadline, sequence, weakref to thread), watched by [Threading.__watch]. See [BaseTask.timeout].
+        self.__deadlines: List[Tuple[float, int, weakref.ref]] = []
+        self.__deadlinesCondition: Condition = Condition()
+        self.__sequence = itertools.count()
+        self.__watchdog: Union[Thread, None] = None
 
 
     @property
@@ -119,6 +586,17 @@ class Threading(object):
             int: How many threads in [Threading.threads].
         """
         return len(self.threads)
+
+    @property
+    def Snapshot(self) -> Dict[int, Union[Thread, Task]]:
+        """
+            Returns a copy of [Threading.threads], safe to iterate while threads are added or retired.
+
+        Returns:
+            Dict[int, Thread]: {thread_id: thread_obj}, as of the call.
+        """
+        with self.__condition:
+            return dict(self.threads)
     
     @property
     def RunningCount(self) -> int:
@@ -128,9 +606,8 @@ class Threading(object):
         Returns:
             int: How many running threads in [Threading.threads].
         """
-        
-        i = [None for v in self.threads.values() if v.IsRunning and not v.IsComplete]
-        return len(i)
+
+        return self.__running
     
     @property
     def CompleteCount(self) -> int:
@@ -141,8 +618,18 @@ class Threading(object):
             int: How many completed threads in [Threading.threads].
         """
 
-        i = [None for v in self.threads.values() if v.IsComplete and not v.IsRunning]
-        return len(i)
+        return self.__complete
+
+    @property
+    def RetiredCount(self) -> int:
+        """
+            Returns how many threads were retired by [Threading.retention] so far.
+
+        Returns:
+            int: How many threads were removed from [Threading.threads] by the retention policy.
+        """
+
+        return self.__retiredCount
     
     @property
     def AllComplete(self) -> bool:
@@ -153,39 +640,157 @@ class Threading(object):
             bool: [True] if all threads are complete, else [False].
         """
 
-        return ((self.RunningCount == 0) and (self.ThreadCount == self.CompleteCount))
+        with self.__condition:
+            return self.__allComplete()
+
+    def WaitAll(self, timeout: Union[float, None] = None) -> bool:
+        """
+            Blocks until [Threading.AllComplete] is [True], without polling.
+
+        Args:
+            timeout (float | None, optional): Maximum time to wait, in seconds. Defaults to None.
+
+        Returns:
+            bool: [True] if all threads are complete, [False] if [timeout] was reached first.
+        """
+
+        with self.__condition:
+            return self.__condition.wait_for(self.__allComplete, timeout)
+
+    def WaitAny(self, timeout: Union[float, None] = None) -> bool:
+        """
+            Blocks until another thread completes, without polling. Returns immediately if all threads are already complete.
+
+        Args:
+            timeout (float | None, optional): Maximum time to wait, in seconds. Defaults to None.
+
+        Returns:
+            bool: [True] if a thread completed (or all already were), [False] if [timeout] was reached first.
+        """
+
+        with self.__condition:
+            completions = self.__completions
+            return self.__condition.wait_for(lambda: self.__completions != completions or self.__allComplete(), timeout)
 
-    def AddThread(self, target: Callable, args: Tuple = (), run: bool = False, custom_data: dict = {}, **kwargs) -> Tuple[int, Thread]:
+    def AddThread(self, target: Callable, args: Tuple = (), run: bool = False, custom_data: dict = {}, done_callback: Callable = None, priority: int = 0,
+                  timeout: Union[float, None] = None, **kwargs) -> Tuple[int, Thread]:
         """
             Add thread to [Threading.threads].
+            The returned thread is also a future-like handle, see [BaseTask.result].
 
         Args:
             target (Callable): Function to thread.
             args (Tuple): Function's parameters.
             run (bool, optional): [True] to start thread, else [False]. Defaults to [False].
+            done_callback (Callable, optional): Called with the thread once its target finishes. See [BaseTask.add_done_callback]. Defaults to None.
+            priority (int, optional): Pool mode only, lower runs first. See [Scheduler]. Defaults to 0.
+            timeout (float | None, optional): Seconds after [Threading.StartThread] before the thread's token is cancelled
+                with a [TimedOutException]. Time spent queued counts. Defaults to None.
 
         Returns:
             int: Created thread id.
             Thread: Created thread.
         """
 
+        created = None if self.profiler is None else time.perf_counter()
+
         ensureType(args, tuple, 'args')
         ensureType(run, bool, 'run')
+        if timeout is not None and timeout <= 0:
+            raise ValueError('[timeout] must be greater than 0')
 
         self.lastId += 1
         thread_id = self.lastId
+        token = CancellationToken()
 
         kwargs['daemon'] = True
         if bool(inspect.getfullargspec(target)[2]):
-            kwargs['kwargs'] = {'threading_obj': self, 'thread_id': thread_id, 'custom_data': custom_data}
+            if self.backend == 'process':
+                # Tokens can't cross processes: process tasks can only be cancelled before they are sent
+                kwargs['kwargs'] = {'thread_id': thread_id, 'custom_data': custom_data}
+            else:
+                kwargs['kwargs'] = {'threading_obj': self, 'thread_id': thread_id, 'custom_data': custom_data, 'cancel_token': token}
+
+        if self.workers is None:
+            t = Thread(target, args, custom_data, token = token, timeout = timeout, **kwargs)
+        else:
+            t = Task(target, args, custom_data, priority = priority, token = token, timeout = timeout, **kwargs)
+        t._setStateHook(functools.partial(self.__onStateChange, thread_id))
+        with self.__condition:
+            self.threads[thread_id] = t
 
-        t = Thread(target, args, custom_data, **kwargs)
-        self.threads[thread_id] = t
+            if self.retention is not None:
+                # Also expires [Retention.keep_for] when nothing completes for a while
+                self.__applyRetention()
+        if self.profiler is not None:
+            self.profiler._added(thread_id, custom_data, created)
+            t._runHook = functools.partial(self.profiler._mark, thread_id, 'running')
+            t.add_done_callback(lambda _: self.profiler._mark(thread_id, 'done'))
+        if done_callback is not None:
+            t.add_done_callback(done_callback)
         if run:
             self.StartThread(thread_id)
 
         return (thread_id, t)
     
+    def Result(self, thread_id: int, timeout: Union[float, None] = None) -> Any:
+        """
+            Waits for [Threading.threads[thread_id]] to finish and returns its target's return value.
+            See [BaseTask.result].
+        """
+        ensureType(thread_id, int, 'thread_id')
+
+        thr = self.threads[thread_id]
+        try:
+            return thr.result(timeout)
+        finally:
+            if thr.done():
+                self.__consumed(thread_id)
+
+    def AwaitThread(self, thread_id: int) -> asyncio.Future:
+        """
+            Async counterpart of [Threading.JoinThread]: returns a future resolved once [Threading.threads[thread_id]] finishes,
+            so coroutines can wait for it without blocking the event loop. The thread still has to be started.
+            See [awaitTask].
+        """
+        ensureType(thread_id, int, 'thread_id')
+
+        return awaitTask(self.threads[thread_id])
+
+    def AsCompleted(self, thread_ids: Iterable[int] = None, timeout: Union[float, None] = None) -> Iterator[Tuple[int, Union[Thread, Task]]]:
+        """
+            Yields threads as their targets finish, in completion order, so results can be consumed without waiting for [Threading.AllComplete].
+            Threads that already finished are yielded first.
+
+        Args:
+            thread_ids (Iterable[int], optional): Ids to wait for. Defaults to every id currently in [Threading.threads].
+            timeout (float | None, optional): Maximum total time to wait, in seconds. Defaults to None.
+
+        Raises:
+            TimeoutError: Raises if not every thread finished in [timeout] seconds.
+
+        Yields:
+            Tuple[int, Thread]: Finished thread id and the thread itself.
+        """
+
+        # One consistent copy: [Threading.retention] may retire threads meanwhile
+        threads = self.Snapshot
+        pending = threads if thread_ids is None else {thread_id: threads[thread_id] for thread_id in thread_ids}
+        deadline = None if timeout is None else time.monotonic() + timeout
+        finished: Queue = Queue()
+
+        for thread_id, thr in pending.items():
+            thr.add_done_callback(lambda _, thread_id = thread_id: finished.put(thread_id))
+
+        for _ in range(len(pending)):
+            try:
+                thread_id = finished.get(timeout = None if deadline is None else max(0, deadline - time.monotonic()))
+            except Empty:
+                raise TimeoutError(f'Not every thread finished in {timeout} seconds')
+
+            yield (thread_id, pending[thread_id])
+            self.__consumed(thread_id)
+
     def JoinThread(self, thread_id: int):
         ensureType(thread_id, int, 'thread_id')
 
@@ -194,8 +799,8 @@ class Threading(object):
             thr.join()
 
         elif not thr.IsComplete:
-            thr.running_.wait()
-            thr.join()
+            # Not [running_]: a task cancelled while queued goes straight to complete without ever running
+            thr.complete_.wait()
         
         else:
             raise NotStartedException
@@ -212,7 +817,16 @@ class Threading(object):
 
         thr = self.threads[thread_id]
         if not thr.IsComplete and not thr.IsRunning:
-            self.__followThread(thread_id)
+            if self.profiler is not None:
+                self.profiler._mark(thread_id, 'start')
+
+            if self.workers is None:
+                self.__followThread(thread_id)
+            else:
+                self.__submit(thread_id)
+
+            if thr.timeout is not None:
+                self.__addDeadline(thr)
         else:
             raise NotStartedException
 
@@ -222,9 +836,24 @@ class Threading(object):
             
             See [Threading.StartThread] for details
         """
-        for thread_id in self.threads.keys():
+        for thread_id in self.Snapshot:
             self.StartThread(thread_id)
     
+    def CancelThread(self, thread_id: int):
+        """
+            Asks [Threading.threads[thread_id]] to stop. See [BaseTask.cancel].
+        """
+        ensureType(thread_id, int, 'thread_id')
+
+        self.threads[thread_id].cancel()
+
+    def CancelAll(self):
+        """
+            Asks every thread in [Threading.threads] to stop. Queued ones will not run.
+        """
+        for thr in self.Snapshot.values():
+            thr.cancel()
+
     def DeleteThread(self, thread_id: int, force: bool = False):
         """
             Deletes thread from [Threading.threads]. Will not stop thread.
@@ -250,7 +879,265 @@ class Threading(object):
             raise ValueError(f'Thread id [{thread_id}] is still running. Call function with [force = True] to ignore this protection.')
         
         else:
-            del self.threads[thread_id]
+            running, complete = value._setStateHook(None)
+            with self.__condition:
+                del self.threads[thread_id]
+                self.__finished.pop(thread_id, None)
+                self.__dropOnComplete.discard(thread_id)
+                self.__count((running, complete), -1)
+                self.__condition.notify_all()
+
+    def Shutdown(self, wait: bool = True):
+        """
+            Stops the worker pool once the already queued tasks are done. Does nothing if [Threading.workers] is [None].
+            Starting a thread afterwards will spawn the workers again.
+
+        Args:
+            wait (bool, optional): [True] to block until every worker has exited, else [False]. Defaults to True.
+        """
+
+        ensureType(wait, bool, 'wait')
+
+        with self.__poolLock:
+            pool = self.__pool
+            self.__pool = []
+
+            for _ in pool:
+                self.__queue.put(None)
+
+        if wait:
+            for worker in pool:
+                worker.join()
+
+        # Deadlines of finished threads are moot, the watchdog exits once none is left
+        with self.__deadlinesCondition:
+            self.__deadlines[:] = [item for item in self.__deadlines if not getattr(item[2](), 'done', lambda: True)()]
+            heapq.heapify(self.__deadlines)
+            self.__deadlinesCondition.notify()
+
+    def __allComplete(self) -> bool:
+        # Must be called holding [Threading.__condition]
+        return ((self.__running == 0) and (len(self.threads) == self.__complete))
+
+    def __count(self, state: Tuple[bool, bool], delta: int):
+        # Must be called holding [Threading.__condition]. Mirrors the old [RunningCount] and [CompleteCount] scans.
+        running, complete = state
+        if running and not complete:
+            self.__running += delta
+        elif complete and not running:
+            self.__complete += delta
+
+    def __onStateChange(self, thread_id: int, task: BaseTask, before: Tuple[bool, bool], after: Tuple[bool, bool]):
+        """
+            State hook given to every thread. See [BaseTask.__stateHook].
+        """
+        if self.profiler is not None:
+            if after == (True, False) and self.backend == 'process':
+                # Targets run in another process, the closest stamp is the chunk being sent. Else see [BaseTask._runHook].
+                self.profiler._mark(thread_id, 'running')
+            elif after[1] and not before[1]:
+                self.profiler._complete(thread_id)
+
+        with self.__condition:
+            self.__count(before, -1)
+            self.__count(after, +1)
+            if after[1] and not before[1]:
+                self.__completions += 1
+
+                if self.retention is not None:
+                    self.__finished[thread_id] = (time.monotonic(), time.time())
+                    if thread_id in self.__dropOnComplete:
+                        self.__dropOnComplete.discard(thread_id)
+                        self.__retire(thread_id)
+                    self.__applyRetention()
+
+            self.__condition.notify_all()
+
+    def __applyRetention(self):
+        """
+            Retires the completed threads [Threading.retention] no longer wants. Must be called holding [Threading.__condition].
+        """
+        keep_last, keep_for = self.retention.keep_last, self.retention.keep_for
+        now = time.monotonic()
+
+        while self.__finished:
+            thread_id, (finished_at, _) = next(iter(self.__finished.items()))
+
+            expired = (keep_last is not None and len(self.__finished) > keep_last) or (keep_for is not None and now - finished_at >= keep_for)
+            if not expired:
+                break
+
+            self.__retire(thread_id)
+
+    def __consumed(self, thread_id: int):
+        # Called once the result of [thread_id] was handed out
+        if self.retention is not None and self.retention.drop_on_result:
+            with self.__condition:
+                # [BaseTask._finish] hands the result out before the thread is marked complete: retire it once it is
+                if thread_id in self.__finished:
+                    self.__retire(thread_id)
+                elif thread_id in self.threads:
+                    self.__dropOnComplete.add(thread_id)
+                self.__condition.notify_all()
+
+    def __retire(self, thread_id: int):
+        """
+            Replaces a completed thread by its [TaskSummary]. Must be called holding [Threading.__condition].
+            Completed is a final state, so the thread's state hook is simply left behind.
+        """
+        finished = self.__finished.pop(thread_id, None)
+        thr = self.threads.get(thread_id)
+        if finished is None or thr is None:
+            return # Not counted as complete yet, deleted or already retired
+
+        del self.threads[thread_id]
+        self.__count((False, True), -1)
+        self.__retiredCount += 1
+
+        exception = thr.exception(0) if thr.done() else None
+        self.retired[thread_id] = TaskSummary(thread_id, finished[1], thr.IsCancelled, thr.IsTimedOut, None if exception is None else repr(exception))
+        while len(self.retired) > self.retention.summaries:
+            self.retired.popitem(last = False)
+
+    def __submit(self, thread_id: int):
+        """
+            Hands a [Task] to the worker pool, spawning the workers on first use.
+
+        Raises:
+            NotStartedException: Raises if the task was already queued.
+        """
+
+        thr: Task = self.threads[thread_id]
+        if thr.queued_.is_set():
+            raise NotStartedException
+
+        with self.__poolLock:
+            if self.backend == 'process':
+                if not self.__pool:
+                    dispatcher = Thread(self.__dispatcher, daemon = True)
+                    dispatcher.start()
+                    self.__pool.append(dispatcher)
+
+            while self.backend == 'thread' and len(self.__pool) < self.workers:
+                worker = Thread(self.__worker, daemon = True)
+                worker.start()
+                self.__pool.append(worker)
+
+            thr.queued_.set()
+            self.__queue.put(thr)
+
+    def __worker(self):
+        """
+            Worker loop: runs queued [Task]s one after another, until it receives [None] from [Threading.Shutdown].
+        """
+        while True:
+            task = self.__queue.get()
+            if task is None:
+                break
+
+            task.startAndJoin()
+            self.__queue.release(task)
+
+    def __addDeadline(self, thr: BaseTask):
+        with self.__deadlinesCondition:
+            heapq.heappush(self.__deadlines, (time.monotonic() + thr.timeout, next(self.__sequence), weakref.ref(thr)))
+
+            if self.__watchdog is None:
+                # Only a weak reference: the watchdog must not keep this [Threading] alive
+                self.__watchdog = Thread(Threading.__watch, (weakref.ref(self), self.__deadlinesCondition, self.__deadlines), daemon = True)
+                self.__watchdog.start()
+
+            self.__deadlinesCondition.notify()
+
+    @staticmethod
+    def __watch(owner: weakref.ref, condition: Condition, deadlines: List[Tuple[float, int, weakref.ref]]):
+        """
+            Watchdog loop: cancels the token of every thread still unfinished at its deadline.
+            A single thread serves every deadline of a [Threading], and exits once none is left or its [Threading] is gone.
+            [__addDeadline] starts a new one if needed.
+        """
+        with condition:
+            while True:
+                now = time.monotonic()
+                while deadlines and deadlines[0][0] <= now:
+                    _, _, ref = heapq.heappop(deadlines)
+                    thr = ref()
+
+                    if thr is not None and not thr.done():
+                        thr.token.cancel(TimedOutException(f'Thread did not finish in {thr.timeout} seconds'))
+                    thr = None
+
+                instance = owner()
+                if instance is None:
+                    return
+                if not deadlines:
+                    instance.__watchdog = None
+                    return
+                instance = None
+
+                condition.wait(deadlines[0][0] - now)
+
+    def __dispatcher(self):
+        """
+            Process backend loop: groups queued [Task]s into chunks of up to [Threading.chunksize] and sends them to worker processes.
+            A task is marked running from the moment its chunk is sent. At most two chunks per process are in flight,
+            so under load tasks pile up in the queue and later chunks fill up.
+        """
+        executor = ProcessPoolExecutor(max_workers = self.workers)
+        slots = Semaphore(self.workers * 2)
+        stop = False
+
+        while not stop:
+            task = self.__queue.get()
+            if task is None:
+                break
+
+            chunk = [task]
+            while len(chunk) < self.chunksize:
+                try:
+                    task = self.__queue.get_nowait()
+                except Empty:
+                    break
+
+                if task is None:
+                    stop = True
+                    break
+                chunk.append(task)
+
+            for task in [task for task in chunk if task._skipIfCancelled()]:
+                chunk.remove(task)
+                self.__queue.release(task)
+
+            if not chunk:
+                continue
+
+            slots.acquire()
+            for task in chunk:
+                task._setState(running = True, complete = False)
+
+            try:
+                future = executor.submit(_runChunk, [(task._target, task._args, task._kwargs) for task in chunk])
+            except Exception as ex:
+                future = Future()
+                future.set_exception(ex)
+
+            future.add_done_callback(lambda future, chunk = chunk: self.__collect(chunk, future, slots))
+
+        executor.shutdown(wait = True)
+
+    def __collect(self, chunk: List[Task], future: Future, slots: Semaphore):
+        """
+            Hands a finished chunk's outcomes back to its [Task]s. If the chunk as a whole failed (e.g. pickling), every task gets that exception.
+        """
+        slots.release()
+
+        exception = future.exception()
+        outcomes = [(None, exception)] * len(chunk) if exception is not None else future.result()
+
+        for task, (result, exception) in zip(chunk, outcomes):
+            task._finish(result, exception)
+            task._setState(running = False, complete = True)
+            self.__queue.release(task)
     
     def __followThread(self, thread_id: int):
         """